@@ -3,5 +3,46 @@
 Python package for NSE/BSE Crawler
 """
 
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
 from crawler.nse_ann import NSEAnnouncementsFetcher
 from crawler.bse_ann import BSEAnnouncementsFetcher
+
+
+class _RootDispatchHandler(logging.Handler):
+    """Forward queued records to whichever handlers the root logger has when they are drained."""
+
+    def emit(self, record: logging.LogRecord):
+        logging.getLogger().handle(record)
+
+
+_log_listener: Optional[QueueListener] = None
+
+
+def setup_logging() -> QueueListener:
+    """
+    Move crawler log I/O onto a background listener thread; call once from the entry point.
+
+    Records are still formatted on the calling thread (QueueHandler.prepare() does that before
+    enqueueing), so only the handler I/O leaves the request path. The crawler logger stops
+    propagating and its records reach the root handlers from the listener thread instead.
+    Repeated calls return the running listener.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return _log_listener
+
+    log_queue = queue.SimpleQueue()
+    crawler_logger = logging.getLogger(__name__)
+    crawler_logger.addHandler(QueueHandler(log_queue))
+    crawler_logger.propagate = False
+
+    _log_listener = QueueListener(log_queue, _RootDispatchHandler())
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    return _log_listener
+
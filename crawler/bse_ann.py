@@ -5,19 +5,88 @@ Production-ready implementation for fetching BSE corporate announcements.
 Uses API endpoints discovered through research and proven pagination methods.
 """
 
-import json
+import asyncio
 import logging
-import time
-from datetime import datetime, timedelta
+import random
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 
+import httpx
+import ijson
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from crawler.cache_store import cache_path, read_cache, write_cache
+from crawler.http_cache import ConditionalRequestCache
+from crawler.rate_limiter import RateLimiter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Full-jitter backoff parameters for retried requests
+BACKOFF_BASE_DELAY = 1.0
+BACKOFF_MAX_DELAY = 30.0
+
+# Responses at least this large (or of unknown size) are stream-parsed instead of loaded whole,
+# and on the async path are decoded off the event loop
+STREAM_PARSE_THRESHOLD = 64 * 1024
+
+# Statuses worth retrying; any other non-2xx/304 status is treated as unrecoverable
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Raised when a 200 carries a non-JSON body, e.g. BSE's HTML block page. Unlike requests'
+# Response.json() errors these are not RequestException subclasses, so they are caught explicitly.
+JSON_DECODE_ERRORS = (orjson.JSONDecodeError, ijson.JSONError, ValueError)
+
+
+def _full_jitter_backoff(attempt: int) -> float:
+    """Random delay in [0, min(cap, base * 2**attempt)] so parallel workers don't retry in lock-step."""
+    return random.uniform(0, min(BACKOFF_MAX_DELAY, BACKOFF_BASE_DELAY * (2 ** attempt)))
+
+
+def _as_date(value: Union[str, date]) -> date:
+    """Normalise a date/datetime or a YYYYMMDD string to a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, '%Y%m%d').date()
+
+
+def _format_bse_date(value: date) -> str:
+    """Format a date as the YYYYMMDD string BSE expects; integer formatting beats strftime here."""
+    return f"{value.year:04d}{value.month:02d}{value.day:02d}"
+
+
+def _announcement_key(announcement: Dict):
+    """Identity of an announcement: NEWSID when present, else scrip code + timestamp + subject."""
+    return announcement.get('NEWSID') or (
+        announcement.get('SCRIP_CD'), announcement.get('NEWS_DT'), announcement.get('NEWSSUB')
+    )
+
+
+def _dedupe(announcements: List[Dict], seen: set) -> List[Dict]:
+    """Return the announcements whose key is not in `seen`, recording their keys as it goes."""
+    new_rows = []
+    for announcement in announcements:
+        key = _announcement_key(announcement)
+        if key not in seen:
+            seen.add(key)
+            new_rows.append(announcement)
+    return new_rows
+
+
+class _FullJitterRetry(Retry):
+    """urllib3 Retry that sleeps a random fraction of the capped exponential backoff."""
+
+    def get_backoff_time(self) -> float:
+        ceiling = min(BACKOFF_MAX_DELAY, super().get_backoff_time())
+        return random.uniform(0, ceiling) if ceiling > 0 else 0
+
 
 class BSEAnnouncementsFetcher:
     """
@@ -25,13 +94,41 @@ class BSEAnnouncementsFetcher:
     Handles pagination and proper parameter management.
     """
 
-    def __init__(self, cache_dir: str = "./cache"):
+    def __init__(self,
+                 cache_dir: str = "./cache",
+                 max_concurrency: int = 5,
+                 max_chunk_concurrency: int = 4,
+                 requests_per_second: int = 4,
+                 page_size: int = 50):
         self.base_url = "https://api.bseindia.com/BseIndiaAPI"
         self.api_base = f"{self.base_url}/api"
         self.session = requests.Session()
+        # One warm pool for the BSE API host; urllib3 handles retry/backoff on transient statuses
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=16,
+            max_retries=_FullJitterRetry(
+                total=3,
+                backoff_factor=BACKOFF_BASE_DELAY,
+                status_forcelist=sorted(RETRYABLE_STATUSES),
+                allowed_methods=["GET"],
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
 
+        # Rows requested per announcements page; a shorter page is always the last one
+        self.page_size = page_size
+
+        # Upper bound on in-flight page requests per date chunk, and on date chunks fetched at once
+        self.max_concurrency = max_concurrency
+        self.max_chunk_concurrency = max_chunk_concurrency
+
+        # Global request ceiling shared by every concurrent chunk/page fetch
+        self.rate_limiter = RateLimiter(requests_per_second)
+
         # Headers required for BSE API based on research
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/115.0',
@@ -47,98 +144,242 @@ class BSEAnnouncementsFetcher:
 
         self.session.headers.update(self.headers)
 
-    def _make_request(self, url: str, params: Optional[Dict] = None, max_retries: int = 3) -> Optional[Dict]:
-        """Make API request with retry logic."""
+        # ETag / Last-Modified store for conditional GETs on repeat polls
+        self.etag_cache = ConditionalRequestCache(self.cache_dir / "etags.sqlite")
+
+    def _make_request(self, url: str, params: Optional[Dict] = None,
+                      stream_key: Optional[str] = None) -> Optional[Dict]:
+        """
+        Make API request. Retries with backoff are handled by the session's HTTPAdapter.
+
+        When `stream_key` is given, large responses are stream-parsed and only the items of
+        that top-level array are kept, e.g. {'Table': [...]}.
+        """
+        cache_key = self.etag_cache.make_key(url, params)
+
+        # A 304 whose cached body is gone gets one more try; load() has dropped the entry by then,
+        # so that request carries no validators and the server sends the full page
+        for refetch in (False, True):
+            try:
+                # Rate limiting: shares the global request ceiling with the async page fetches
+                self.rate_limiter.acquire()
+
+                with self.session.get(
+                        url,
+                        params=params,
+                        headers={**self.headers, **self.etag_cache.conditional_headers(cache_key)},
+                        timeout=30,
+                        stream=stream_key is not None
+                ) as response:
+                    if response.status_code == 304:
+                        cached = self.etag_cache.load(cache_key)
+                        if cached is not None:
+                            return cached
+                        if not refetch:
+                            logger.warning("Got 304 without a cached body, refetching unconditionally")
+                            continue
+                        logger.warning("Got 304 without a cached body")
+                    elif response.status_code == 200:
+                        data = self._decode_json(response, stream_key)
+                        self.etag_cache.store(cache_key, response.headers, data)
+                        return data
+                    else:
+                        logger.warning("Request failed with status %s", response.status_code)
+
+            except requests.exceptions.RequestException as e:
+                logger.error("Request error: %s", e)
+            except JSON_DECODE_ERRORS as e:
+                logger.error("Invalid JSON response: %s", e)
+
+            return None
+
+        return None
+
+    @staticmethod
+    def _decode_json(response: requests.Response, stream_key: Optional[str] = None) -> Any:
+        """Decode a JSON body, streaming large payloads so only `stream_key` items are materialised."""
+        content_length = response.headers.get('Content-Length')
+        if stream_key and (content_length is None or int(content_length) >= STREAM_PARSE_THRESHOLD):
+            response.raw.decode_content = True
+            return {stream_key: list(ijson.items(response.raw, f"{stream_key}.item", use_float=True))}
+        return orjson.loads(response.content)
+
+    @staticmethod
+    def _chunk_data_range(start_date: Union[str, date], end_date: Union[str, date], max_days: int = 1):
+        """Split date range into BSE-compatible chunks."""
+        start_date = _as_date(start_date)
+        end_date = _as_date(end_date)
+
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        formatted = [_format_bse_date(d) for d in days]
+
+        if max_days == 1:
+            return [(day, day) for day in formatted]
+
+        return [
+            (formatted[i], formatted[min(i + max_days, len(formatted)) - 1])
+            for i in range(0, len(formatted), max_days)
+        ]
+
+    async def _make_request_async(
+            self,
+            client: httpx.AsyncClient,
+            url: str,
+            params: Optional[Dict] = None,
+            max_retries: int = 3
+    ) -> Optional[Dict]:
+        """Make API request on the shared HTTP/2 client with retry logic."""
+        cache_key = self.etag_cache.make_key(url, params)
+        refetched = False
+
         for attempt in range(max_retries):
             try:
                 # Rate limiting
-                time.sleep(0.5)  # Conservative rate limiting for BSE
+                await self.rate_limiter.acquire_async()
 
-                response = self.session.get(
+                response = await client.get(
                     url,
                     params=params,
-                    headers=self.headers,
-                    timeout=30
+                    headers=self.etag_cache.conditional_headers(cache_key)
                 )
 
-                if response.status_code == 200:
-                    return response.json()
+                if response.status_code == 304:
+                    cached = self.etag_cache.load(cache_key)
+                    if cached is not None:
+                        return cached
+                    # load() dropped the entry, so the retry goes out without validators
+                    logger.warning("Got 304 without a cached body, attempt %s", attempt + 1)
+                    if not refetched:
+                        refetched = True
+                        continue
+                elif response.status_code == 200:
+                    # Decode large bodies on a worker thread so other in-flight pages keep progressing
+                    if len(response.content) >= STREAM_PARSE_THRESHOLD:
+                        data = await asyncio.to_thread(orjson.loads, response.content)
+                    else:
+                        data = orjson.loads(response.content)
+                    self.etag_cache.store(cache_key, response.headers, data)
+                    return data
+                elif response.status_code in RETRYABLE_STATUSES:
+                    logger.warning("Request failed with status %s, attempt %s", response.status_code, attempt + 1)
                 else:
-                    logger.warning(f"Request failed with status {response.status_code}, attempt {attempt + 1}")
+                    # 4xx responses won't change on retry
+                    logger.error("Request failed with unrecoverable status %s", response.status_code)
+                    return None
+
+            except JSON_DECODE_ERRORS as e:
+                # A block page instead of JSON fails this page only; retry rather than abort the crawl
+                logger.warning("Invalid JSON response on attempt %s: %s", attempt + 1, e)
+            except httpx.TransportError as e:
+                # Timeouts and connection-level failures
+                logger.error("Request error on attempt %s: %s", attempt + 1, e)
+            except httpx.HTTPError as e:
+                logger.error("Unrecoverable request error: %s", e)
+                return None
+
+            if attempt < max_retries - 1:
+                await asyncio.sleep(_full_jitter_backoff(attempt))
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request error on attempt {attempt + 1}: {e}")
+        return None
 
-            # Exponential backoff
-            time.sleep(2 ** attempt)
+    async def _fetch_page(
+            self,
+            client: httpx.AsyncClient,
+            semaphore: asyncio.Semaphore,
+            url: str,
+            params: Dict,
+            page_no: int
+    ) -> List[Dict]:
+        """Fetch a single announcements page, returning an empty list when there is no data."""
+        async with semaphore:
+            logger.debug("Fetching page %d...", page_no)
+            data = await self._make_request_async(client, url, {**params, 'pageno': page_no})
 
-        return None
+        if data and 'Table' in data and data['Table']:
+            return data['Table']
+        return []
 
-    @staticmethod
-    def _chunk_data_range(start_date: str, end_date: str, max_days: int = 1):
-        """Split date range into BSE-compatible chunks."""
-        start_date = datetime.strptime(start_date, '%Y%m%d')
-        end_date = datetime.strptime(end_date, '%Y%m%d')
-        chunks = []
-
-        current_day = start_date
-        while current_day <= end_date:
-            chunk_end = min(current_day + timedelta(days=max_days - 1), end_date)
-            chunks.append((
-                current_day.strftime('%Y%m%d'),
-                chunk_end.strftime('%Y%m%d'),
-            ))
-            current_day = chunk_end + timedelta(days=1)
-
-        return chunks
-
-    def _fetch_date_chunk(
+    async def _fetch_date_chunk(
             self,
+            client: httpx.AsyncClient,
             url: str,
             from_date_bse: str,
             to_date_bse: str,
             category: str = '-1',
             search_type: str = 'P'
     ) -> List[Dict]:
-        """Fetch single date chunk with proper BSE pagination."""
-        announcements = []
-        page_no = 1
+        """
+        Fetch single date chunk with proper BSE pagination.
+
+        The first page is fetched on its own to learn whether more exist. Remaining pages are
+        requested concurrently in batches that double in size until a page comes back short,
+        empty, or only repeating rows already seen (BSE pages occasionally overlap).
+        """
+        params = {
+            'strCat': category,
+            'strPrevDate': from_date_bse,
+            'strScrip': '',
+            'strSearch': search_type,
+            'strToDate': to_date_bse,
+            'strType': 'C',
+            'PageSize': self.page_size
+        }
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        seen = set()
+
+        first_page = await self._fetch_page(client, semaphore, url, params, 1)
+        announcements = _dedupe(first_page, seen)
+        if not announcements:
+            logger.info("No data found for date chunk")
+            return announcements
+        if len(first_page) < self.page_size:
+            logger.info("No more data found. Total pages processed: 1")
+            return announcements
+
+        pages_processed = 1
+        next_page = 2
+        batch_size = 1
 
         while True:
-            params = {
-                'pageno': page_no,
-                'strCat': category,
-                'strPrevDate': from_date_bse,
-                'strScrip': '',
-                'strSearch': search_type,
-                'strToDate': to_date_bse,
-                'strType': 'C',
-                'PageSize': 50
-            }
-
-            logger.info(f"Fetching page {page_no}...")
-            data = self._make_request(url, params)
-
-            if data and 'Table' in data and data['Table']:
-                page_announcements = data['Table']
-                announcements.extend(page_announcements)
-                logger.info(f"Page {page_no}: Retrieved {len(announcements)} announcements")
-                page_no += 1
-            else:
-                logger.info(f"No more data found. Total pages processed: {page_no - 1}")
+            page_numbers = range(next_page, next_page + batch_size)
+            pages = await asyncio.gather(
+                *(self._fetch_page(client, semaphore, url, params, page_no) for page_no in page_numbers)
+            )
+
+            # Keep pages in order up to the first empty (or fully repeated) one; anything after it is past the end
+            exhausted = False
+            for page_no, page_announcements in zip(page_numbers, pages):
+                new_rows = _dedupe(page_announcements, seen)
+                if not new_rows:
+                    exhausted = True
+                    break
+                announcements.extend(new_rows)
+                pages_processed += 1
+                logger.debug("Page %d: Retrieved %d announcements", page_no, len(announcements))
+
+                # A short page is provably the last; the empty-page check covers exact multiples
+                if len(page_announcements) < self.page_size:
+                    exhausted = True
+                    break
+
+            if exhausted:
+                logger.info("No more data found. Total pages processed: %s", pages_processed)
                 break
 
-        logger.info(f"Total announcements retrieved: {len(announcements)}")
+            next_page += batch_size
+            batch_size *= 2
+
+        logger.info("Total announcements retrieved: %s", len(announcements))
         return announcements
 
-    def get_announcements_paginated(self, from_date: str, to_date: str,
-                                    category: str = '-1', search_type: str = 'P') -> List[Dict]:
+    async def get_announcements_paginated_async(self, from_date: Union[str, date], to_date: Union[str, date],
+                                                category: str = '-1', search_type: str = 'P') -> List[Dict]:
         """
         Fetch all announcements with automatic pagination.
 
         Args:
-            from_date: Start date in YYYYMMDD format
-            to_date: End date in YYYYMMDD format
+            from_date: Start date, as a date or in YYYYMMDD format
+            to_date: End date, as a date or in YYYYMMDD format
             category: Category filter (-1 for all)
             search_type: Search type (P for public)
 
@@ -151,24 +392,55 @@ class BSEAnnouncementsFetcher:
         date_chunks = self._chunk_data_range(from_date, to_date)
         all_announcements = []
 
-        logger.info(f"Fetching BSE announcements from {from_date} to {to_date}")
+        logger.info("Fetching BSE announcements from %s to %s", from_date, to_date)
+
+        chunk_semaphore = asyncio.Semaphore(self.max_chunk_concurrency)
+
+        # HTTP/2 multiplexes the concurrent page requests over a single TLS connection.
+        # Connection-specific headers are not allowed on HTTP/2, so keep-alive is left to the client.
+        async with httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+                headers={k: v for k, v in self.headers.items() if k.lower() != 'connection'},
+                timeout=30
+        ) as client:
+            async def fetch_chunk(chunk_start: str, chunk_end: str) -> List[Dict]:
+                async with chunk_semaphore:
+                    return await self._fetch_date_chunk(
+                        client, url, chunk_start, chunk_end, category, search_type
+                    )
+
+            # Chunks are independent date windows; results are merged back in date order
+            chunks_data = await asyncio.gather(
+                *(fetch_chunk(chunk_start, chunk_end) for chunk_start, chunk_end in date_chunks)
+            )
+
+        # Chunks can share boundary rows; drop any announcement already collected
+        seen = set()
+        for chunk_data in chunks_data:
+            all_announcements.extend(_dedupe(chunk_data, seen))
+
+        logger.info("Total announcements retrieved: %s", len(all_announcements))
+        return all_announcements
 
-        for chunk_start, chunk_end in date_chunks:
-            chunk_data = self._fetch_date_chunk(url, chunk_start, chunk_end, category, search_type)
-            all_announcements.extend(chunk_data)
-            time.sleep(1)
+    def get_announcements_paginated(self, from_date: Union[str, date], to_date: Union[str, date],
+                                    category: str = '-1', search_type: str = 'P') -> List[Dict]:
+        """
+        Synchronous wrapper around `get_announcements_paginated_async`.
 
-        logger.info(f"Total announcements retrieved: {len(all_announcements)}")
-        return all_announcements
+        Must not be called from inside a running event loop; await the async variant there instead.
+        """
+        return asyncio.run(self.get_announcements_paginated_async(from_date, to_date, category, search_type))
 
-    def get_company_announcements(self, script_code: str, from_date: str, to_date: str) -> List[Dict]:
+    def get_company_announcements(self, script_code: str, from_date: Union[str, date],
+                                  to_date: Union[str, date]) -> List[Dict]:
         """
         Fetch announcements for a specific company.
 
         Args:
             script_code: BSE script code for the company
-            from_date: Start date in YYYYMMDD format
-            to_date: End date in YYYYMMDD format
+            from_date: Start date, as a date or in YYYYMMDD format
+            to_date: End date, as a date or in YYYYMMDD format
 
         Returns:
             List of company-specific announcements
@@ -178,23 +450,23 @@ class BSEAnnouncementsFetcher:
         params = {
             'pageno': 1,
             'strCat': '-1',
-            'strPrevDate': from_date,
+            'strPrevDate': _format_bse_date(_as_date(from_date)),
             'strScrip': script_code,
             'strSearch': 'P',
-            'strToDate': to_date,
+            'strToDate': _format_bse_date(_as_date(to_date)),
             'strType': 'C',
             'subcategory': ''
         }
 
-        logger.info(f"Fetching announcements for script code: {script_code}")
+        logger.info("Fetching announcements for script code: %s", script_code)
 
-        data = self._make_request(url, params)
+        data = self._make_request(url, params, stream_key='Table')
         if data and 'Table' in data:
             announcements = data['Table']
-            logger.info(f"Retrieved {len(announcements)} announcements for {script_code}")
+            logger.info("Retrieved %s announcements for %s", len(announcements), script_code)
             return announcements
         else:
-            logger.error(f"Failed to retrieve announcements for {script_code}")
+            logger.error("Failed to retrieve announcements for %s", script_code)
             return []
 
     def get_corporate_actions(self, script_code: str = "") -> List[Dict]:
@@ -225,18 +497,29 @@ class BSEAnnouncementsFetcher:
             return []
 
     def save_to_cache(self, data: Any, filename: str) -> bool:
-        """Save data to cache file."""
+        """Save data to a zstd-compressed JSON cache file (".zst" is appended to the filename)."""
         try:
-            cache_file = self.cache_dir / filename
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
-            logger.info(f"Data saved to {cache_file}")
+            cache_file = cache_path(self.cache_dir, filename)
+            write_cache(cache_file, data)
+            logger.info("Data saved to %s", cache_file)
             return True
         except Exception as e:
-            logger.error(f"Failed to save cache: {e}")
+            logger.error("Failed to save cache: %s", e)
             return False
 
+    def load_from_cache(self, filename: str) -> Optional[Any]:
+        """Load data written by save_to_cache, or None if the file is missing or unreadable."""
+        cache_file = cache_path(self.cache_dir, filename)
+        if not cache_file.exists():
+            return None
+        try:
+            return read_cache(cache_file)
+        except Exception as e:
+            logger.error("Failed to load cache %s: %s", cache_file, e)
+            return None
+
     def close(self):
         """Close the session."""
         self.session.close()
+        self.etag_cache.close()
         logger.info("Session closed")
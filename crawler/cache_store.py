@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Compressed Cache Files
+Reads and writes fetcher caches as zstd-compressed JSON.
+"""
+
+from pathlib import Path
+from typing import Any
+
+import orjson
+import zstandard as zstd
+
+CACHE_SUFFIX = ".zst"
+COMPRESSION_LEVEL = 3
+
+
+def cache_path(cache_dir: Path, filename: str) -> Path:
+    """Resolve a cache filename inside cache_dir, adding the .zst suffix if it is missing."""
+    if not filename.endswith(CACHE_SUFFIX):
+        filename = f"{filename}{CACHE_SUFFIX}"
+    return Path(cache_dir) / filename
+
+
+def write_cache(cache_file: Path, data: Any) -> None:
+    """Serialize data with orjson and write it zstd-compressed."""
+    payload = orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    cache_file.write_bytes(zstd.ZstdCompressor(level=COMPRESSION_LEVEL).compress(payload))
+
+
+def read_cache(cache_file: Path) -> Any:
+    """Decompress and decode a file written by write_cache."""
+    return orjson.loads(zstd.ZstdDecompressor().decompress(cache_file.read_bytes()))
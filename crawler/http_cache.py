@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Conditional GET Cache
+Persists ETag/Last-Modified validators alongside response bodies so that repeat polls of
+unchanged announcement pages can be answered with a 304 and served from disk.
+"""
+
+import gzip
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ConditionalRequestCache:
+    """SQLite-backed store of HTTP validators and gzip-compressed JSON bodies."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS etags (
+                    key TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body BLOB
+                )
+                """
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Build a stable cache key from the URL and its query parameters."""
+        items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        return json.dumps([url, items])
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for a cached entry, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM etags WHERE key = ?", (key,)
+            ).fetchone()
+
+        headers = {}
+        if row:
+            etag, last_modified = row
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def load(self, key: str) -> Optional[Any]:
+        """
+        Return the decoded JSON body stored for a key, or None when missing/corrupt.
+
+        An entry whose body cannot be read is deleted, so the next request for the key is sent
+        without validators instead of drawing another 304 there is nothing to answer with.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM etags WHERE key = ?", (key,)).fetchone()
+
+        if not row:
+            return None
+
+        try:
+            return json.loads(gzip.decompress(row[0]))
+        except Exception as e:
+            logger.warning("Discarding unreadable cache entry: %s", e)
+            self.invalidate(key)
+            return None
+
+    def invalidate(self, key: str) -> None:
+        """Forget the validators and body stored for a key."""
+        with self._lock:
+            self._conn.execute("DELETE FROM etags WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def store(self, key: str, headers, data: Any) -> None:
+        """Record validators and body of a 200 response. Responses without validators are skipped."""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        body = gzip.compress(json.dumps(data, ensure_ascii=False, default=str).encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO etags (key, etag, last_modified, body) VALUES (?, ?, ?, ?)",
+                (key, etag, last_modified, body)
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
@@ -7,49 +7,83 @@ Based on proven approaches from NseIndiaApi library patterns.
 
 import json
 import logging
+import queue
 import random
+import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 import cloudscraper
+import orjson
 import requests
 import urllib3
-from fake_useragent import UserAgent
+
+from crawler.cache_store import cache_path, read_cache, write_cache
+from crawler.http_cache import ConditionalRequestCache
 
 urllib3.disable_warnings()
 
+# Raised when a 200 carries a non-JSON body, e.g. an Akamai challenge page. Unlike requests'
+# Response.json() errors these are not RequestException subclasses, so they are caught explicitly.
+JSON_DECODE_ERRORS = (orjson.JSONDecodeError, ValueError)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Recent desktop Chrome user agents; one is picked per fetcher instead of loading fake_useragent's dataset
+CHROME_USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/124.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/125.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/126.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/127.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/124.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/126.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/125.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/127.0.0.0 Safari/537.36',
+)
+
 
 class NSEAnnouncementsFetcher:
     """
     Production-ready NSE announcements fetcher using session management.
     Avoids Playwright dependency by using proven session-based approach.
+
+    Keeps a small pool of pre-warmed cloudscraper sessions so that a session tripping
+    NSE's anti-bot protection can be replaced in the background while others keep serving.
     """
 
-    def __init__(self, cache_dir: str = "./cache"):
-        self.scraper = cloudscraper.CloudScraper(
-            browser={
-                'browser': 'chrome',
-                'platform': 'windows',
-                'desktop': True,
-            },
-            debug=False
-        )
-        self.ua = UserAgent()
+    def __init__(self, cache_dir: str = "./cache", pool_size: int = 3):
         self.base_url = "https://www.nseindia.com"
         self.api_base = f"{self.base_url}/api"
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self.max_session_duration = 300
-        self.session_start_time = None
+        self.announcements_page = f"{self.base_url}/companies-listing/corporate-filings-announcements"
+
+        # Minimum gap between consecutive API calls, enforced against the last request time
+        self.min_request_interval = 1.0
+        self._last_req_ts = 0.0
+        self._throttle_lock = threading.Lock()
+
+        # Clearance cookies persisted across runs; they are only honoured with the User-Agent that earned them
+        self.cookie_file = self.cache_dir / "nse_cookies.json"
+        self._cookie_lock = threading.Lock()
+        saved_session = self._read_saved_session()
 
         # Production-tested headers that work with NSE
         self.headers = {
-            'User-Agent': self.ua.chrome,
+            'User-Agent': random.choice(CHROME_USER_AGENTS),
+            'Referer': self.announcements_page,
             'Accept': 'application/json, text/plain, */*',
             'Accept-Language': 'en-US,en;q=0.9',
             'Accept-Encoding': 'gzip, deflate, br',
@@ -61,67 +95,252 @@ class NSEAnnouncementsFetcher:
             'Cache-Control': 'no-cache',
             'Pragma': 'no-cache'
         }
+        if saved_session:
+            self.headers['User-Agent'] = saved_session['user_agent']
+
+        # Pool of (scraper, session_start_time) pairs ready to serve requests
+        self.pool_size = pool_size
+        self.pool_timeout = 120
+        self._scraper_pool: "queue.Queue[Tuple[cloudscraper.CloudScraper, float]]" = queue.Queue()
+        self._scrapers: List[cloudscraper.CloudScraper] = []
+        self._scrapers_lock = threading.Lock()
+
+        # ETag / Last-Modified store for conditional GETs on repeat polls
+        self.etag_cache = ConditionalRequestCache(self.cache_dir / "etags.sqlite")
 
-        self.scraper.headers.update(self.headers)
         self._initialize_session()
 
-    def _initialize_session(self) -> bool:
-        """Initialize session by visiting NSE homepage to get cookies."""
+    def _create_scraper(self) -> cloudscraper.CloudScraper:
+        """Create a cloudscraper session carrying the NSE headers."""
+        scraper = cloudscraper.CloudScraper(
+            browser={
+                'browser': 'chrome',
+                'platform': 'windows',
+                'desktop': True,
+            },
+            debug=False
+        )
+        scraper.headers.update(self.headers)
+
+        with self._scrapers_lock:
+            self._scrapers.append(scraper)
+        return scraper
+
+    def _warm_scraper(self, scraper: cloudscraper.CloudScraper) -> bool:
+        """Visit NSE homepage and the announcements page to get cookies."""
         try:
             logger.info("Initializing NSE session...")
-            response = self.scraper.get(self.base_url, timeout=30)
+            response = scraper.get(self.base_url, timeout=30)
             if response.status_code == 200:
+                # CRITICAL: Visit the announcement page once so API calls carry its cookies
+                scraper.get(self.announcements_page, timeout=30)
+
                 logger.info("Session initialized successfully")
-                self.session_start_time = time.time()
                 # Human-like delay
                 time.sleep(random.uniform(2, 4))
                 return True
             else:
-                logger.error(f"Failed to initialize session: {response.status_code}")
+                logger.error("Failed to initialize session: %s", response.status_code)
                 return False
         except Exception as e:
-            logger.error(f"Session initialization error: {e}")
+            logger.error("Session initialization error: %s", e)
             return False
 
-    def _make_request(self, url: str, params: Optional[Dict] = None, max_retries: int = 3) -> Optional[Dict]:
-        """Make API request with retry logic and rate limiting."""
-        for attempt in range(max_retries):
+    def _read_saved_session(self) -> Optional[Dict]:
+        """Load persisted cookies and their User-Agent, dropping expired cookies."""
+        try:
+            with self._cookie_lock:
+                if not self.cookie_file.exists():
+                    return None
+                saved = json.loads(self.cookie_file.read_text(encoding='utf-8'))
+        except Exception as e:
+            logger.warning("Ignoring unreadable NSE cookie cache: %s", e)
+            return None
+
+        now = time.time()
+        cookies = [c for c in saved.get('cookies', []) if not c.get('expires') or c['expires'] > now]
+        if not cookies or not saved.get('user_agent'):
+            return None
+        return {'user_agent': saved['user_agent'], 'cookies': cookies}
+
+    def _save_session(self, scraper: cloudscraper.CloudScraper):
+        """Persist a warmed scraper's cookies so later runs can skip the challenge solve."""
+        cookies = [
+            {
+                'name': c.name,
+                'value': c.value,
+                'domain': c.domain,
+                'path': c.path,
+                'expires': c.expires,
+                'secure': c.secure
+            }
+            for c in scraper.cookies
+        ]
+        try:
+            with self._cookie_lock:
+                self.cookie_file.write_text(
+                    json.dumps({'user_agent': self.headers['User-Agent'], 'cookies': cookies}),
+                    encoding='utf-8'
+                )
+        except Exception as e:
+            logger.warning("Failed to persist NSE cookies: %s", e)
+
+    def _discard_saved_session(self):
+        """Delete persisted cookies that NSE has started rejecting so nothing reloads them."""
+        try:
+            with self._cookie_lock:
+                self.cookie_file.unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning("Failed to discard NSE cookie cache: %s", e)
+
+    def _restore_session(self, scraper: cloudscraper.CloudScraper) -> bool:
+        """Seed a scraper with persisted cookies and confirm them with one cheap API call."""
+        saved = self._read_saved_session()
+        if not saved or saved['user_agent'] != self.headers['User-Agent']:
+            return False
+
+        for c in saved['cookies']:
+            scraper.cookies.set(
+                c['name'], c['value'],
+                domain=c['domain'], path=c['path'], expires=c['expires'], secure=c['secure']
+            )
+
+        try:
+            response = scraper.get(f"{self.api_base}/marketStatus", timeout=15)
+            if response.status_code == 200:
+                logger.info("Reused cached NSE session cookies")
+                return True
+        except requests.exceptions.RequestException as e:
+            logger.warning("Cached NSE cookies could not be validated: %s", e)
+
+        scraper.cookies.clear()
+        return False
+
+    def _add_scraper(self, force_warm: bool = False) -> bool:
+        """
+        Create and warm a scraper, then hand it to the pool (even if warming failed).
+
+        Persisted cookies are only tried when filling the pool at start-up; replacements for
+        retired or expired scrapers pass force_warm so they always earn fresh cookies.
+        """
+        scraper = self._create_scraper()
+        warmed = False if force_warm else self._restore_session(scraper)
+        if not warmed:
+            warmed = self._warm_scraper(scraper)
+            if warmed:
+                self._save_session(scraper)
+        self._scraper_pool.put((scraper, time.time()))
+        return warmed
+
+    def _spawn_replacement(self, force_warm: bool = False):
+        """Warm a new scraper on a background thread so callers never wait on a challenge solve."""
+        threading.Thread(target=self._add_scraper, args=(force_warm,), daemon=True).start()
+
+    def _retire_scraper(self, scraper: cloudscraper.CloudScraper, blocked: bool = False):
+        """
+        Drop a burnt or expired scraper and start warming a fresh replacement.
+
+        When the scraper was retired for an anti-bot status its cookies are blocked, so the
+        persisted copy is discarded as well.
+        """
+        with self._scrapers_lock:
+            if scraper in self._scrapers:
+                self._scrapers.remove(scraper)
+        scraper.close()
+        if blocked:
+            self._discard_saved_session()
+        self._spawn_replacement(force_warm=True)
+
+    def _initialize_session(self) -> bool:
+        """Fill the scraper pool: the first scraper is warmed inline, the rest in the background."""
+        warmed = self._add_scraper()
+        for _ in range(self.pool_size - 1):
+            self._spawn_replacement()
+        return warmed
+
+    def _checkout_scraper(self) -> Optional[Tuple[cloudscraper.CloudScraper, float]]:
+        """Take a live scraper from the pool, replacing any whose session has expired."""
+        while True:
             try:
-                # Add referer for each request
-                self.scraper.headers["Referer"] = f"{self.base_url}/companies-listing/corporate-filings-announcements"
+                scraper, started_at = self._scraper_pool.get(timeout=self.pool_timeout)
+            except queue.Empty:
+                logger.error("No NSE session became available in time")
+                return None
 
-                # CRITICAL: Visit the announcement page first
-                self.scraper.get(self.scraper.headers["Referer"], timeout=30)
-                # Allow session establishment
-                time.sleep(random.uniform(2, 4))
+            if not self._session_expired(started_at):
+                return scraper, started_at
+
+            logger.info("NSE session expired, refreshing in background")
+            self._retire_scraper(scraper)
+
+    def _make_request(self, url: str, params: Optional[Dict] = None, max_retries: int = 3) -> Optional[Dict]:
+        """Make API request with retry logic and rate limiting."""
+        cache_key = self.etag_cache.make_key(url, params)
 
-                response = self.scraper.get(url, params=params, timeout=45)
+        for attempt in range(max_retries):
+            checkout = self._checkout_scraper()
+            if checkout is None:
+                return None
+            scraper, started_at = checkout
 
-                if response.status_code == 200:
-                    return response.json()
+            try:
+                # Referer is primed when the scraper is warmed; only enforce a minimum gap here
+                self._throttle()
+
+                response = scraper.get(
+                    url,
+                    params=params,
+                    headers=self.etag_cache.conditional_headers(cache_key),
+                    timeout=45
+                )
+
+                if response.status_code == 304:
+                    cached = self.etag_cache.load(cache_key)
+                    if cached is not None:
+                        return cached
+                    # load() dropped the entry, so the next attempt goes out without validators
+                    logger.warning("Got 304 without a cached body, attempt %s", attempt + 1)
+                elif response.status_code == 200:
+                    data = orjson.loads(response.content)
+                    self.etag_cache.store(cache_key, response.headers, data)
+                    return data
                 elif response.status_code in [403, 429, 503]:
-                    # Anti-bot triggered, wait and reinitialize
+                    # Anti-bot triggered, replace this session in the background and wait
                     logger.warning("# Anti-bot triggered, wait and reinitialize...")
+                    self._retire_scraper(scraper, blocked=True)
+                    scraper = None
                     # Exponential backoff + Human-like delay
                     wait_time = (2 ** attempt) * random.uniform(10, 20)
                     time.sleep(wait_time)
-                    self._initialize_session()
                 else:
-                    logger.warning(f"Request failed with status {response.status_code}, attempt {attempt + 1}")
+                    logger.warning("Request failed with status %s, attempt %s", response.status_code, attempt + 1)
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request error on attempt {attempt + 1}: {e}")
+            except (requests.exceptions.RequestException, *JSON_DECODE_ERRORS) as e:
+                logger.error("Request error on attempt %s: %s", attempt + 1, e)
                 if attempt < max_retries - 1:
+                    self._retire_scraper(scraper)
+                    scraper = None
                     time.sleep(random.uniform(15, 30))
-                    self._initialize_session()
+
+            finally:
+                if scraper is not None:
+                    self._scraper_pool.put((scraper, started_at))
 
         return None
 
-    def _session_expired(self):
+    def _throttle(self):
+        """Sleep only if the previous request was issued less than min_request_interval ago."""
+        with self._throttle_lock:
+            elapsed = time.time() - self._last_req_ts
+            if elapsed < self.min_request_interval:
+                time.sleep(self.min_request_interval - elapsed)
+            self._last_req_ts = time.time()
+
+    def _session_expired(self, session_start_time: Optional[float]) -> bool:
         """Check if session needs refresh"""
-        if not self.session_start_time:
+        if not session_start_time:
             return True
-        return (time.time() - self.session_start_time) > self.max_session_duration
+        return (time.time() - session_start_time) > self.max_session_duration
 
     @staticmethod
     def is_valid_response(data):
@@ -147,10 +366,6 @@ class NSEAnnouncementsFetcher:
         Returns:
             List of announcement dictionaries
         """
-        if not self.scraper or self._session_expired():
-            if not self._initialize_session():
-                return []
-
         url = f"{self.api_base}/corporate-announcements"
         params = {
             'index': index,
@@ -158,15 +373,15 @@ class NSEAnnouncementsFetcher:
             'to_date': to_date
         }
 
-        logger.info(f"Fetching announcements from {from_date} to {to_date}")
+        logger.info("Fetching announcements from %s to %s", from_date, to_date)
 
         response = self._make_request(url, params)
 
         if self.is_valid_response(response):
-            logger.info(f"Retrieved {len(response.get('data', []))} announcements")
+            logger.info("Retrieved %s announcements", len(response.get('data', [])))
             return response.get('data', [])
         elif response and isinstance(response, list):
-            logger.info(f"Retrieved {len(response)} announcements")
+            logger.info("Retrieved %s announcements", len(response))
             return response
         else:
             logger.error("Failed to retrieve announcements or invalid data format")
@@ -189,29 +404,43 @@ class NSEAnnouncementsFetcher:
             'period': period
         }
 
-        logger.info(f"Fetching {period} financial results")
+        logger.info("Fetching %s financial results", period)
 
         data = self._make_request(url, params)
         if data:
-            logger.info(f"Retrieved financial results")
+            logger.info("Retrieved financial results")
             return data if isinstance(data, list) else [data]
         else:
             logger.error("Failed to retrieve financial results")
             return []
 
     def save_to_cache(self, data: Any, filename: str) -> bool:
-        """Save data to cache file."""
+        """Save data to a zstd-compressed JSON cache file (".zst" is appended to the filename)."""
         try:
-            cache_file = self.cache_dir / filename
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
-            logger.info(f"Data saved to {cache_file}")
+            cache_file = cache_path(self.cache_dir, filename)
+            write_cache(cache_file, data)
+            logger.info("Data saved to %s", cache_file)
             return True
         except Exception as e:
-            logger.error(f"Failed to save cache: {e}")
+            logger.error("Failed to save cache: %s", e)
             return False
 
+    def load_from_cache(self, filename: str) -> Optional[Any]:
+        """Load data written by save_to_cache, or None if the file is missing or unreadable."""
+        cache_file = cache_path(self.cache_dir, filename)
+        if not cache_file.exists():
+            return None
+        try:
+            return read_cache(cache_file)
+        except Exception as e:
+            logger.error("Failed to load cache %s: %s", cache_file, e)
+            return None
+
     def close(self):
-        """Close the session."""
-        self.scraper.close()
+        """Close all pooled sessions."""
+        with self._scrapers_lock:
+            scrapers, self._scrapers = self._scrapers, []
+        for scraper in scrapers:
+            scraper.close()
+        self.etag_cache.close()
         logger.info("Session closed")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Request Rate Limiter
+Thread-safe sliding-window limiter shared by synchronous and asyncio request paths.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+
+class RateLimiter:
+    """Allow at most `rate` requests in any `period`-second window across all callers."""
+
+    def __init__(self, rate: int = 4, period: float = 1.0):
+        self.rate = rate
+        self.period = period
+        self._slots = deque(maxlen=rate)
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Claim the next free request slot and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = now
+            if len(self._slots) == self.rate:
+                slot = max(now, self._slots[0] + self.period)
+            self._slots.append(slot)
+            return slot - now
+
+    def acquire(self):
+        """Block the calling thread until a request slot is available."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Suspend the calling coroutine until a request slot is available."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -7,16 +7,23 @@ Handles all database operations for announcements and financial snapshots
 with proper connection pooling, error handling, and transaction management.
 """
 
+import csv
+import io
 import logging
 import re
+import uuid
+import weakref
 from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
 from datetime import datetime, timezone, date
-from typing import Dict, List, Optional
+from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
 
-import pandas as pd
+import orjson
 import psycopg2
-from psycopg2 import pool
-from psycopg2.extras import RealDictCursor, Json
+from psycopg2 import pool, sql
+from psycopg2.extras import RealDictCursor, execute_values
 
 from config import (
     POSTGRES_HOST,
@@ -26,9 +33,133 @@ from config import (
     POSTGRES_PASSWORD
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+
+# Announcement category -> confidence; anything else is LOW
+_CONF_MAP = {"Result": "HIGH", "Board Meeting": "MEDIUM"}
+
+# Timestamp prefix plus optional fractional seconds, used when fromisoformat rejects the input
+_ISO_RE = re.compile(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(\.\d+)?')
+
+# Tables that export_to_dataframe may read
+_EXPORTABLE_TABLES = frozenset({'announcements', 'financial_snapshots'})
+
+# PostgreSQL type OIDs whose COPY CSV text needs converting back to what read_sql returned
+_PG_TEXT_OIDS = frozenset({25, 1042, 1043})
+_PG_TIMESTAMP_OID = 1114
+_PG_TIMESTAMPTZ_OID = 1184
+_PG_DATE_OID = 1082
+_PG_JSON_OIDS = frozenset({114, 3802})
+_PG_NUMERIC_OID = 1700
+
+# Secondary indexes backing the read paths; the (symbol, filing_date) unique keys already
+# serve the ON CONFLICT targets and the announcements/snapshots join
+_INDEXES = (
+    # get_latest_announcements: ORDER BY filing_date DESC LIMIT n
+    "CREATE INDEX IF NOT EXISTS idx_announcements_filing_date_desc "
+    "ON announcements (filing_date DESC)",
+    # get_latest_announcements(confidence=...): filtered variant of the same ordering
+    "CREATE INDEX IF NOT EXISTS idx_announcements_confidence_filing_date "
+    "ON announcements (confidence, filing_date DESC)",
+)
+
+# Batches larger than this are staged with COPY instead of multi-row VALUES inserts
+_COPY_THRESHOLD = 1000
+
+# Announcement batches at least this large are prepared column-wise with pandas
+_VECTORIZE_THRESHOLD = 5000
+
+# Marker written for None values in COPY CSV payloads
+_COPY_NULL = r'\N'
+
+_ANNOUNCEMENT_COLUMNS = (
+    'symbol', 'company_name', 'filing_date', 'category', 'headline',
+    'confidence', 'raw_json', 'minio_path', 'pdf_stored'
+)
+
+_ANNOUNCEMENT_PLACEHOLDERS = tuple(
+    f'%({col})s::jsonb' if col == 'raw_json' else f'%({col})s' for col in _ANNOUNCEMENT_COLUMNS
+)
+
+# Source fields read from a BSE announcement, with the defaults used when a key is absent
+_ANN_KEYS = (
+    'SCRIP_CD', 'SLONGNAME', 'NEWS_DT', 'DT_TM', 'CATEGORYNAME',
+    'NEWSSUB', 'NEWSID', 'minio_path', 'pdf_stored'
+)
+_ANN_DEFAULTS = {**dict.fromkeys(_ANN_KEYS), 'NEWSSUB': '', 'pdf_stored': False}
+_get_announcement_fields = itemgetter(*_ANN_KEYS)
+
+# COPY path payload: confidence is computed server-side from category
+_COPY_ANNOUNCEMENT_COLUMNS = tuple(col for col in _ANNOUNCEMENT_COLUMNS if col != 'confidence')
+
+_CONFIDENCE_SQL = "CASE category {} ELSE 'LOW' END".format(
+    ' '.join(f"WHEN '{category}' THEN '{confidence}'" for category, confidence in _CONF_MAP.items())
+)
+
+_SNAPSHOT_COLUMNS = (
+    'symbol', 'filing_date', 'fy_end', 'quarter', 'audit_status',
+    'total_debt', 'cash_equiv', 'revenue', 'interest_income', 'dividend_income'
+)
+
+_ANNOUNCEMENT_UPSERT = """
+    ON CONFLICT (symbol, filing_date)
+    DO UPDATE SET
+        company_name = EXCLUDED.company_name,
+        category = EXCLUDED.category,
+        headline = EXCLUDED.headline,
+        confidence = EXCLUDED.confidence,
+        raw_json = EXCLUDED.raw_json,
+        minio_path = EXCLUDED.minio_path,
+        pdf_stored = EXCLUDED.pdf_stored
+    RETURNING (xmax = 0) AS inserted
+"""
+
+_SNAPSHOT_UPSERT = """
+    ON CONFLICT (symbol, filing_date)
+    DO UPDATE SET
+        fy_end = EXCLUDED.fy_end,
+        quarter = EXCLUDED.quarter,
+        audit_status = EXCLUDED.audit_status,
+        total_debt = EXCLUDED.total_debt,
+        cash_equiv = EXCLUDED.cash_equiv,
+        revenue = EXCLUDED.revenue,
+        interest_income = EXCLUDED.interest_income,
+        dividend_income = EXCLUDED.dividend_income,
+        parsed_at = now()
+    RETURNING (xmax = 0) AS inserted
+"""
+
+
+# Opt-in session settings for bulk ETL workers. synchronous_commit=off can lose the last
+# few commits on a server crash, which ON CONFLICT upserts make safe to simply re-run.
+BULK_ETL_SESSION_SETTINGS = {
+    'synchronous_commit': 'off',
+    'work_mem': '64MB',
+    'maintenance_work_mem': '256MB',
+    'jit': 'off'
+}
+
+
+def _parse_csv_date(value: str) -> Optional[date]:
+    """COPY CSV date field to a date, as psycopg2 returns it"""
+    return date.fromisoformat(value) if value else None
+
+
+def _parse_csv_json(value: str):
+    """COPY CSV json/jsonb field to the decoded value, as psycopg2 returns it"""
+    return orjson.loads(value) if value else None
+
+
+def _parse_csv_numeric(value: str) -> Optional[Decimal]:
+    """COPY CSV numeric field to a Decimal, as psycopg2 returns it"""
+    return Decimal(value) if value else None
+
 
 class BSEDatabaseManager:
     """Production-ready PostgreSQL integration for BSE financial data"""
@@ -40,17 +171,22 @@ class BSEDatabaseManager:
                  user: str = None,
                  password: str = None,
                  min_connections: int = 2,
-                 max_connections: int = 20):
+                 max_connections: int = 20,
+                 session_settings: Optional[Dict[str, str]] = None):
 
         self.connection_params = {
             'host': host or POSTGRES_HOST,
             'port': port or POSTGRES_PORT,
             'database': database or POSTGRES_DB,
             'user': user or POSTGRES_USER,
-            'password': password or POSTGRES_PASSWORD,
-            'cursor_factory': RealDictCursor
+            'password': password or POSTGRES_PASSWORD
         }
 
+        # Applied once per pooled connection, e.g. BULK_ETL_SESSION_SETTINGS. Configured connections
+        # are tracked weakly so ones the pool closes drop out of the set.
+        self.session_settings = dict(session_settings or {})
+        self._configured_connections = weakref.WeakSet()
+
         # Initialize connection pool
         try:
             self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
@@ -65,7 +201,7 @@ class BSEDatabaseManager:
                 with conn.cursor() as cursor:
                     cursor.execute("SELECT version();")
                     version = cursor.fetchone()
-                    logger.info(f"Connected to PostgreSQL: {version['version'][:50]}...")
+                    logger.info(f"Connected to PostgreSQL: {version[0][:50]}...")
 
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
@@ -85,6 +221,11 @@ class BSEDatabaseManager:
         conn = None
         try:
             conn = self.connection_pool.getconn()
+            # Batches rely on one explicit transaction; never hand out a connection left in autocommit
+            if conn.autocommit:
+                conn.autocommit = False
+            if self.session_settings and conn not in self._configured_connections:
+                self._configure_session(conn)
             yield conn
         except Exception as e:
             if conn:
@@ -95,6 +236,15 @@ class BSEDatabaseManager:
             if conn:
                 self.connection_pool.putconn(conn)
 
+    def _configure_session(self, conn):
+        """Apply the configured session settings to a freshly opened connection"""
+        with conn.cursor() as cursor:
+            for name, value in self.session_settings.items():
+                cursor.execute("SELECT set_config(%s, %s, false)", (name, value))
+        # Commit so the settings outlive the current transaction
+        conn.commit()
+        self._configured_connections.add(conn)
+
     def insert_announcements(self, announcements_data: List[Dict]) -> int:
         """
         Insert or update announcements data in bulk
@@ -109,42 +259,39 @@ class BSEDatabaseManager:
             logger.warning("No announcements data to insert")
             return 0
 
-        processed_count = 0
+        if len(announcements_data) >= _VECTORIZE_THRESHOLD:
+            prepared = self._prepare_announcements_batch(announcements_data)
+        else:
+            prepared = (row for row in map(self._prepare_announcement_data, announcements_data) if row)
+        rows = self._dedupe_on_key(prepared)
+        if not rows:
+            logger.warning("No valid announcements to insert")
+            return 0
 
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
                 try:
-                    for announcement in announcements_data:
-                        # Prepare data for insertion
-                        insert_data = self._prepare_announcement_data(announcement)
-
-                        # Use ON CONFLICT to handle duplicates
-                        insert_query = """
-                        INSERT INTO announcements (
-                            symbol, company_name, filing_date, category, headline,
-                            confidence, raw_json, minio_path, pdf_stored
-                        ) VALUES (
-                            %(symbol)s, %(company_name)s, %(filing_date)s, %(category)s, %(headline)s,
-                            %(confidence)s, %(raw_json)s, %(minio_path)s, %(pdf_stored)s
-                        ) ON CONFLICT (symbol, filing_date) 
-                        DO UPDATE SET
-                            company_name = EXCLUDED.company_name,
-                            category = EXCLUDED.category,
-                            headline = EXCLUDED.headline,
-                            confidence = EXCLUDED.confidence,
-                            raw_json = EXCLUDED.raw_json,
-                            minio_path = EXCLUDED.minio_path,
-                            pdf_stored = EXCLUDED.pdf_stored
+                    if len(rows) > _COPY_THRESHOLD:
+                        results = self._bulk_copy_announcements(cursor, rows)
+                    else:
+                        # One multi-row upsert per page instead of a round trip per announcement.
+                        # xmax = 0 only for freshly inserted rows, which separates inserts from updates.
+                        insert_query = f"""
+                        INSERT INTO announcements ({', '.join(_ANNOUNCEMENT_COLUMNS)})
+                        VALUES %s
+                        {_ANNOUNCEMENT_UPSERT}
                         """
+                        # raw_json arrives pre-serialized, so the server casts it instead of an adapter
+                        template = f"({', '.join(_ANNOUNCEMENT_PLACEHOLDERS)})"
 
-                        cursor.execute(insert_query, insert_data)
-
-                        if cursor.rowcount == 1:
-                            self.stats['announcements_inserted'] += 1
-                        else:
-                            self.stats['announcements_updated'] += 1
+                        results = execute_values(
+                            cursor, insert_query, rows, template=template, page_size=500, fetch=True
+                        )
 
-                        processed_count += 1
+                    inserted = sum(1 for (was_inserted,) in results if was_inserted)
+                    self.stats['announcements_inserted'] += inserted
+                    self.stats['announcements_updated'] += len(results) - inserted
+                    processed_count = len(rows)
 
                     conn.commit()
                     logger.info(f"Successfully processed {processed_count} announcements")
@@ -157,6 +304,61 @@ class BSEDatabaseManager:
 
         return processed_count
 
+    @staticmethod
+    def _dedupe_on_key(rows) -> List[Dict]:
+        """
+        Keep the last row per (symbol, filing_date).
+
+        A single multi-row ON CONFLICT DO UPDATE cannot touch the same row twice, so batches
+        must be unique on the conflict key; later rows win, as they did with per-row upserts.
+        """
+        unique = {}
+        for row in rows:
+            unique[(row['symbol'], row['filing_date'])] = row
+        return list(unique.values())
+
+    def update_pdf_statuses(self, updates: List[tuple]) -> int:
+        """
+        Apply many PDF status updates in one statement
+
+        Args:
+            updates: (symbol, filing_date, minio_path, pdf_stored) tuples
+
+        Returns:
+            Number of distinct announcements submitted
+        """
+        if not updates:
+            return 0
+
+        # One UPDATE per announcement; the last status reported for a key wins
+        rows = list({(symbol, filing_date): (symbol, filing_date, minio_path, pdf_stored)
+                     for symbol, filing_date, minio_path, pdf_stored in updates}.values())
+
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                try:
+                    update_query = """
+                    UPDATE announcements
+                        SET minio_path = data.minio_path, pdf_stored = data.pdf_stored
+                        FROM (VALUES %s) AS data (symbol, filing_date, minio_path, pdf_stored)
+                        WHERE announcements.symbol = data.symbol
+                          AND announcements.filing_date = data.filing_date
+                    """
+                    execute_values(
+                        cursor, update_query, rows, template="(%s, %s, %s::text, %s::boolean)", page_size=500
+                    )
+
+                    conn.commit()
+                    logger.info(f"Successfully updated PDF status for {len(rows)} announcements")
+
+                except Exception as e:
+                    conn.rollback()
+                    self.stats['errors'] += 1
+                    logger.error(f"Failed to update PDF statuses: {e}")
+                    raise
+
+        return len(rows)
+
     def insert_financial_snapshots(self, snapshots_data: List[Dict]) -> int:
         """
         Insert or update financial snapshots data
@@ -171,63 +373,16 @@ class BSEDatabaseManager:
             logger.warning("No financial snapshots to insert")
             return 0
 
-        processed_count = 0
-
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
                 try:
-                    for snapshot in snapshots_data:
-                        # Prepare data for insertion
-                        insert_data = self._prepare_snapshot_data(snapshot)
-
-                        # Only insert if corresponding announcement exists
-                        check_query = """
-                                      SELECT 1 as alias
-                                      FROM announcements
-                                      WHERE symbol = %(symbol)s
-                                        AND filing_date = %(filing_date)s \
-                                      """
-                        cursor.execute(check_query, {
-                            'symbol': insert_data['symbol'],
-                            'filing_date': insert_data['filing_date']
-                        })
-
-                        if not cursor.fetchone():
-                            logger.warning(
-                                f"No announcement found for snapshot: {insert_data['symbol']} "
-                                f"on {insert_data['filing_date']}"
-                            )
-                            continue
-
-                        # Insert or update snapshot
-                        insert_query = """
-                        INSERT INTO financial_snapshots (
-                            symbol, filing_date, fy_end, quarter, audit_status,
-                            total_debt, cash_equiv, revenue, interest_income, dividend_income
-                        ) VALUES (
-                            %(symbol)s, %(filing_date)s, %(fy_end)s, %(quarter)s, %(audit_status)s,
-                            %(total_debt)s, %(cash_equiv)s, %(revenue)s, %(interest_income)s, %(dividend_income)s
-                        ) ON CONFLICT (symbol, filing_date)
-                        DO UPDATE SET
-                            fy_end = EXCLUDED.fy_end,
-                            quarter = EXCLUDED.quarter,
-                            audit_status = EXCLUDED.audit_status,
-                            total_debt = EXCLUDED.total_debt,
-                            cash_equiv = EXCLUDED.cash_equiv,
-                            revenue = EXCLUDED.revenue,
-                            interest_income = EXCLUDED.interest_income,
-                            dividend_income = EXCLUDED.dividend_income,
-                            parsed_at = now()
-                        """
-
-                        cursor.execute(insert_query, insert_data)
-
-                        if cursor.rowcount == 1:
-                            self.stats['snapshots_inserted'] += 1
-                        else:
-                            self.stats['snapshots_updated'] += 1
+                    rows = self._dedupe_on_key(map(self._prepare_snapshot_data, snapshots_data))
+                    results = self._upsert_snapshots(cursor, rows)
 
-                        processed_count += 1
+                    inserted = sum(1 for (was_inserted,) in results if was_inserted)
+                    self.stats['snapshots_inserted'] += inserted
+                    self.stats['snapshots_updated'] += len(results) - inserted
+                    processed_count = len(results)
 
                     conn.commit()
                     logger.info(f"Successfully processed {processed_count} financial snapshots")
@@ -241,16 +396,117 @@ class BSEDatabaseManager:
         return processed_count
 
     @staticmethod
+    def _copy_rows(cursor, table: str, columns, rows: List[Dict]):
+        """Stream rows into a table with COPY ... FROM STDIN using an in-memory CSV buffer"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([
+                _COPY_NULL if value is None else value
+                for value in (row[col] for col in columns)
+            ])
+        buffer.seek(0)
+
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT CSV, NULL '{_COPY_NULL}')",
+            buffer
+        )
+
+    def _bulk_copy_announcements(self, cursor, rows: List[Dict]) -> List:
+        """
+        Upsert a large announcement batch by COPYing into a temp table and merging from there.
+
+        confidence is left out of the COPY payload and derived from category on the server.
+        """
+        staged = ', '.join(_COPY_ANNOUNCEMENT_COLUMNS)
+        # CREATE TABLE AS carries no NOT NULL constraints, so the omitted column is not required
+        cursor.execute(f"CREATE TEMP TABLE tmp_ann ON COMMIT DROP AS SELECT {staged} FROM announcements WITH NO DATA")
+        self._copy_rows(cursor, 'tmp_ann', _COPY_ANNOUNCEMENT_COLUMNS, rows)
+
+        cursor.execute(f"""
+        INSERT INTO announcements ({staged}, confidence)
+        SELECT {staged}, {_CONFIDENCE_SQL} FROM tmp_ann
+        {_ANNOUNCEMENT_UPSERT}
+        """)
+        return cursor.fetchall()
+
+    def _upsert_snapshots(self, cursor, rows: List[Dict]) -> List:
+        """
+        Upsert snapshots in one set-based statement, keeping only those with a filed announcement.
+
+        Rows are staged in a temp table (COPY for large batches, execute_values otherwise) so the
+        announcement check happens in SQL rather than as a SELECT per snapshot.
+        """
+        columns = ', '.join(_SNAPSHOT_COLUMNS)
+        # CREATE TABLE AS carries no NOT NULL constraints: a snapshot missing its symbol or filing date
+        # is staged, reported below and skipped, instead of failing the COPY and the whole batch
+        cursor.execute(
+            f"CREATE TEMP TABLE tmp_snap ON COMMIT DROP AS SELECT {columns} FROM financial_snapshots WITH NO DATA"
+        )
+        if len(rows) > _COPY_THRESHOLD:
+            self._copy_rows(cursor, 'tmp_snap', _SNAPSHOT_COLUMNS, rows)
+        else:
+            execute_values(
+                cursor,
+                f"INSERT INTO tmp_snap ({columns}) VALUES %s",
+                rows,
+                template=f"({', '.join(f'%({col})s' for col in _SNAPSHOT_COLUMNS)})",
+                page_size=500
+            )
+
+        cursor.execute("""
+        SELECT s.symbol, s.filing_date FROM tmp_snap s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM announcements a
+            WHERE a.symbol = s.symbol AND a.filing_date = s.filing_date
+        )
+        """)
+        for symbol, filing_date in cursor.fetchall():
+            if not symbol or filing_date is None:
+                logger.warning(f"Skipping incomplete snapshot: symbol={symbol!r}, filing_date={filing_date!r}")
+            else:
+                logger.warning(f"No announcement found for snapshot: {symbol} on {filing_date}")
+
+        # The equality join also rules out rows with a NULL symbol or filing date
+        cursor.execute(f"""
+        INSERT INTO financial_snapshots ({columns})
+        SELECT {', '.join(f's.{col}' for col in _SNAPSHOT_COLUMNS)} FROM tmp_snap s
+        WHERE EXISTS (
+            SELECT 1 FROM announcements a
+            WHERE a.symbol = s.symbol AND a.filing_date = s.filing_date
+        )
+        {_SNAPSHOT_UPSERT}
+        """)
+        return cursor.fetchall()
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
     def parse_iso_datetime(dt_str: str) -> datetime:
         """
         Parse an ISO datetime string.
+
+        Memoized: filing timestamps repeat heavily across announcements and their snapshots.
         """
+        # Fast path: the C parser handles the common shapes; the regex below covers the rest
+        # (e.g. fractional seconds that are not 3 or 6 digits on older Pythons)
+        if dt_str.endswith('Z'):
+            dt_str = dt_str[:-1] + '+00:00'
+        try:
+            parsed = datetime.fromisoformat(dt_str)
+        except ValueError:
+            pass
+        else:
+            # Naive timestamps are taken as UTC; explicit offsets are converted rather than dropped
+            if parsed.tzinfo is None:
+                return parsed.replace(tzinfo=_UTC)
+            return parsed.astimezone(_UTC)
+
         # Normalize fractional seconds to 6 digits for microseconds if present
         # Match fractional seconds and pad/truncate as needed
-        m = re.match(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(\.\d+)?', dt_str)
+        m = _ISO_RE.match(dt_str)
         if not m:
             # fallback parse
-            return datetime.strptime(dt_str, '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc)
+            return datetime.strptime(dt_str, '%Y-%m-%dT%H:%M:%S').replace(tzinfo=_UTC)
 
         base = m.group(1)
         frac = m.group(2) or ''
@@ -262,19 +518,23 @@ class BSEDatabaseManager:
         else:
             normalized = base
 
-        return datetime.fromisoformat(normalized).replace(tzinfo=timezone.utc)
+        return datetime.fromisoformat(normalized).replace(tzinfo=_UTC)
 
     def _prepare_announcement_data(self, announcement: Dict) -> Optional[Dict]:
         """Prepare announcement data for database insertion"""
         try:
+            (scrip_cd, company_name, news_dt, dt_tm, category,
+             headline, news_id, minio_path, pdf_stored) = _get_announcement_fields({**_ANN_DEFAULTS, **announcement})
+
             # Handle filing_date conversion
-            symbol = str(announcement.get("SCRIP_CD") or '').strip()
-            filing_date = announcement.get('NEWS_DT') or announcement.get('DT_TM')
+            symbol = str(scrip_cd or '').strip()
+            filing_date = news_dt or dt_tm
+            # Confidence is looked up on the stripped category, as the COPY path's CASE sees it
+            category = (category or "").strip()
 
             # ── SKIP rows that break the NOT-NULL PK ─────────────────────
             if not symbol or not filing_date:
-                logger.warning("Skipping: missing symbol/filing_date NEWSID=%s",
-                               announcement.get("NEWSID"))
+                logger.warning("Skipping: missing symbol/filing_date NEWSID=%s", news_id)
                 return None
             # ─────────────────────────────────────────────────────────────
 
@@ -286,29 +546,72 @@ class BSEDatabaseManager:
                     logger.error(f"Failed parsing filing_date '{filing_date}': {e}")
                     raise
 
-            if announcement.get("CATEGORYNAME") == "Result":
-                confidence = "HIGH"
-            elif announcement.get("CATEGORYNAME") == "Board Meeting":
-                confidence = "MEDIUM"
-            else:
-                confidence = "LOW"
-
             return {
                 'symbol': symbol,
-                'company_name': (announcement.get("SLONGNAME") or "").strip(),
+                'company_name': (company_name or "").strip(),
                 'filing_date': filing_date,
-                'category': (announcement.get("CATEGORYNAME") or "").strip(),
-                'headline': announcement.get("NEWSSUB", "")[:600],
-                'confidence': confidence,
-                'raw_json': Json(announcement),  # Store complete original data
-                'minio_path': announcement.get('minio_path', None),
-                'pdf_stored': announcement.get('pdf_stored', False)
+                'category': category,
+                # An explicit None is treated like a missing key, as the DataFrame path cannot tell them apart
+                'headline': ('' if headline is None else str(headline))[:600],
+                'confidence': _CONF_MAP.get(category, "LOW"),
+                'raw_json': orjson.dumps(announcement, default=str).decode(),  # Store complete original data
+                'minio_path': minio_path,
+                'pdf_stored': bool(pdf_stored)
             }
         except Exception as e:
             logger.error(f"Error preparing announcement data: {e}")
             logger.error(f"Problematic data: {announcement}")
             raise
 
+    @staticmethod
+    def _prepare_announcements_batch(announcements: List[Dict]) -> List[Dict]:
+        """
+        Column-wise equivalent of _prepare_announcement_data for large batches.
+
+        The batch is transposed into a DataFrame so stripping, truncation and confidence mapping
+        run as vectorized pandas operations instead of per-row Python. The output must match
+        the per-row path exactly, which is why None is treated like a missing key there too.
+        """
+        import pandas as pd
+
+        # dtype=object keeps source values as-is (no int->float upcasting of SCRIP_CD around gaps)
+        df = pd.DataFrame(announcements, dtype=object).reindex(columns=list(_ANN_KEYS))
+
+        symbols = df['SCRIP_CD'].astype(object).where(df['SCRIP_CD'].notna(), '').astype(str).str.strip()
+        raw_dates = df['NEWS_DT'].where(df['NEWS_DT'].notna() & (df['NEWS_DT'] != ''), df['DT_TM'])
+
+        # ── SKIP rows that break the NOT-NULL PK ─────────────────────
+        valid = (symbols != '') & raw_dates.notna() & (raw_dates != '')
+        for news_id in df.loc[~valid, 'NEWSID']:
+            logger.warning("Skipping: missing symbol/filing_date NEWSID=%s", news_id)
+        if not valid.any():
+            return []
+        df, symbols, raw_dates = df[valid], symbols[valid], raw_dates[valid]
+        # ─────────────────────────────────────────────────────────────
+
+        # Parsed through the same memoized parser as the per-row path; repeated timestamps are cache hits
+        parse = BSEDatabaseManager.parse_iso_datetime
+        filing_dates = [parse(value) if isinstance(value, str) else value for value in raw_dates]
+
+        categories = df['CATEGORYNAME'].fillna('').astype(str).str.strip()
+        raw_json = [
+            orjson.dumps(announcement, default=str).decode()
+            for announcement, keep in zip(announcements, valid) if keep
+        ]
+
+        columns = (
+            symbols.tolist(),
+            df['SLONGNAME'].fillna('').astype(str).str.strip().tolist(),
+            filing_dates,
+            categories.tolist(),
+            df['NEWSSUB'].fillna('').astype(str).str.slice(0, 600).tolist(),
+            categories.map(_CONF_MAP).fillna('LOW').tolist(),
+            raw_json,
+            df['minio_path'].astype(object).where(df['minio_path'].notna(), None).tolist(),
+            df['pdf_stored'].astype('boolean').fillna(False).astype(bool).tolist()
+        )
+        return [dict(zip(_ANNOUNCEMENT_COLUMNS, values)) for values in zip(*columns)]
+
     def _prepare_snapshot_data(self, snapshot: Dict) -> Dict:
         """Prepare financial snapshot data for database insertion"""
         try:
@@ -343,6 +646,7 @@ class BSEDatabaseManager:
             raise
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _parse_fy_end(period_str: Optional[str]) -> Optional[date]:
         """Parse fiscal year-end date from period string"""
         if not period_str:
@@ -358,90 +662,192 @@ class BSEDatabaseManager:
             logger.error(f"Error parsing fiscal year-end date: {e}")
             return None
 
+    def create_indexes(self):
+        """Create the secondary indexes used by the read paths (idempotent)"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                try:
+                    for statement in _INDEXES:
+                        cursor.execute(statement)
+                    conn.commit()
+                    logger.info(f"Ensured {len(_INDEXES)} secondary indexes")
+
+                except Exception as e:
+                    conn.rollback()
+                    logger.error(f"Failed to create indexes: {e}")
+                    raise
+
     def get_latest_announcements(self, limit: int = 100, confidence: str = None) -> List[Dict]:
         """Retrieve recent announcements from database"""
         with self.get_connection() as conn:
-            with conn.cursor() as cursor:
-                query = """
-                SELECT symbol, company_name, filing_date, category, headline,
-                       confidence, minio_path, pdf_stored
-                FROM announcements
-                """
-                params = {}
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(*self._latest_announcements_query(limit, confidence))
+                # RealDictRow is already a dict subclass
+                return cursor.fetchall()
+
+    def iter_latest_announcements(self, limit: int = None, confidence: str = None,
+                                  itersize: int = 1000) -> Iterator[Dict]:
+        """Stream recent announcements through a server-side cursor; limit=None reads them all"""
+        yield from self._iter_query(*self._latest_announcements_query(limit, confidence), itersize=itersize)
+
+    @staticmethod
+    def _latest_announcements_query(limit: Optional[int], confidence: Optional[str]):
+        """Build the recent-announcements query and its parameters"""
+        query = """
+        SELECT symbol, company_name, filing_date, category, headline,
+               confidence, minio_path, pdf_stored
+        FROM announcements
+        """
+        params = {}
 
-                if confidence:
-                    query += " WHERE confidence = %(confidence)s"
-                    params['confidence'] = confidence
+        if confidence:
+            query += " WHERE confidence = %(confidence)s"
+            params['confidence'] = confidence
 
-                query += " ORDER BY filing_date DESC LIMIT %(limit)s"
-                params['limit'] = limit
+        # LIMIT NULL places no limit
+        query += " ORDER BY filing_date DESC LIMIT %(limit)s"
+        params['limit'] = limit
 
-                cursor.execute(query, params)
-                return [dict(row) for row in cursor.fetchall()]
+        return query, params
 
     def get_financial_data(self, symbol: str = None, limit: int = 50) -> List[Dict]:
         """Retrieve financial snapshots with announcement data"""
         with self.get_connection() as conn:
-            with conn.cursor() as cursor:
-                query = """
-                SELECT a.symbol, a.company_name, a.filing_date, a.category,
-                       f.quarter, f.audit_status, f.fy_end,
-                       f.total_debt, f.cash_equiv, f.revenue,
-                       f.interest_income, f.dividend_income
-                FROM announcements a
-                JOIN financial_snapshots f ON a.symbol = f.symbol AND a.filing_date = f.filing_date
-                """
-                params = {}
-
-                if symbol:
-                    query += " WHERE a.symbol = %(symbol)s"
-                    params['symbol'] = symbol
-
-                query += " ORDER BY a.filing_date DESC LIMIT %(limit)s"
-                params['limit'] = limit
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(*self._financial_data_query(symbol, limit))
+                # RealDictRow is already a dict subclass
+                return cursor.fetchall()
 
+    def iter_financial_data(self, symbol: str = None, limit: int = None,
+                            itersize: int = 1000) -> Iterator[Dict]:
+        """Stream financial snapshots with announcement data through a server-side cursor"""
+        yield from self._iter_query(*self._financial_data_query(symbol, limit), itersize=itersize)
+
+    @staticmethod
+    def _financial_data_query(symbol: Optional[str], limit: Optional[int]):
+        """Build the snapshots-with-announcements query and its parameters"""
+        query = """
+        SELECT a.symbol, a.company_name, a.filing_date, a.category,
+               f.quarter, f.audit_status, f.fy_end,
+               f.total_debt, f.cash_equiv, f.revenue,
+               f.interest_income, f.dividend_income
+        FROM announcements a
+        JOIN financial_snapshots f ON a.symbol = f.symbol AND a.filing_date = f.filing_date
+        """
+        params = {}
+
+        if symbol:
+            query += " WHERE a.symbol = %(symbol)s"
+            params['symbol'] = symbol
+
+        query += " ORDER BY a.filing_date DESC LIMIT %(limit)s"
+        params['limit'] = limit
+
+        return query, params
+
+    def _iter_query(self, query: str, params: Dict, itersize: int = 1000) -> Iterator[Dict]:
+        """
+        Yield dict rows from a named (server-side) cursor.
+
+        Rows are fetched itersize at a time, so memory stays bounded however large the result is.
+        """
+        with self.get_connection() as conn:
+            with conn.cursor(name=f"stream_{uuid.uuid4().hex}", cursor_factory=RealDictCursor) as cursor:
+                cursor.itersize = itersize
                 cursor.execute(query, params)
-                return [dict(row) for row in cursor.fetchall()]
+                yield from cursor
 
     def get_database_stats(self) -> Dict:
         """Get comprehensive database statistics"""
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
-                statistics = {}
-
-                # Announcements statistics
+                # Both tables are aggregated in one statement to save a round trip
                 cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_announcements,
-                    COUNT(*) FILTER (WHERE confidence = 'HIGH') as high_confidence,
-                    COUNT(*) FILTER (WHERE pdf_stored = true) as pdfs_stored,
-                    MAX(filing_date) as latest_filing,
-                    COUNT(DISTINCT symbol) as unique_companies
-                FROM announcements
+                WITH a AS (
+                    SELECT
+                        COUNT(*) as total_announcements,
+                        COUNT(*) FILTER (WHERE confidence = 'HIGH') as high_confidence,
+                        COUNT(*) FILTER (WHERE pdf_stored = true) as pdfs_stored,
+                        MAX(filing_date) as latest_filing,
+                        COUNT(DISTINCT symbol) as unique_companies
+                    FROM announcements
+                ), f AS (
+                    SELECT
+                        COUNT(*) as financial_snapshots,
+                        COUNT(*) FILTER (WHERE total_debt IS NOT NULL) as with_debt_data,
+                        COUNT(*) FILTER (WHERE revenue IS NOT NULL) as with_revenue_data,
+                        COUNT(DISTINCT quarter) as quarters_covered
+                    FROM financial_snapshots
+                )
+                SELECT * FROM a CROSS JOIN f
                 """)
-                statistics.update(dict(cursor.fetchone()))
+                return self._row_to_dict(cursor, cursor.fetchone())
 
-                # Financial snapshots statistics
-                cursor.execute("""
-                SELECT 
-                    COUNT(*) as financial_snapshots,
-                    COUNT(*) FILTER (WHERE total_debt IS NOT NULL) as with_debt_data,
-                    COUNT(*) FILTER (WHERE revenue IS NOT NULL) as with_revenue_data,
-                    COUNT(DISTINCT quarter) as quarters_covered
-                FROM financial_snapshots
-                """)
-                statistics.update(dict(cursor.fetchone()))
-
-                return statistics
+    @staticmethod
+    def _row_to_dict(cursor, row) -> Dict:
+        """Map a tuple row to a dict keyed by the cursor's column names"""
+        return {column.name: value for column, value in zip(cursor.description, row)}
 
-    def export_to_dataframe(self, table: str = 'announcements', limit: int = None) -> pd.DataFrame:
+    def export_to_dataframe(self, table: str = 'announcements', limit: int = None) -> 'pd.DataFrame':
         """Export table data to pandas DataFrame for analysis"""
+        # pandas is heavy to import and only needed here
+        import pandas as pd
+
+        if table not in _EXPORTABLE_TABLES:
+            raise ValueError(f"Unknown table for export: {table}")
+
+        # COPY takes no bind parameters, so the identifier and limit are composed client-side
+        # with proper quoting; LIMIT NULL exports the whole table
+        query = sql.SQL("COPY (SELECT * FROM {} LIMIT {}) TO STDOUT WITH CSV HEADER").format(
+            sql.Identifier(table), sql.Literal(int(limit) if limit else None)
+        )
+
+        # COPY streams the result as CSV and lets pandas' C parser build the frame directly
+        buffer = io.StringIO()
         with self.get_connection() as conn:
-            query = f"SELECT * FROM {table}"
-            if limit:
-                query += f" LIMIT {limit}"
+            with conn.cursor() as cursor:
+                # An empty result still describes the columns, so the CSV can be typed like read_sql
+                cursor.execute(sql.SQL("SELECT * FROM {} LIMIT 0").format(sql.Identifier(table)))
+                column_types = [(column.name, column.type_code) for column in cursor.description]
+                cursor.copy_expert(query, buffer)
 
-            return pd.read_sql_query(query, conn)
+        buffer.seek(0)
+        return self._read_copy_csv(pd, buffer, column_types)
+
+    @staticmethod
+    def _read_copy_csv(pd, buffer: io.StringIO, column_types: List[tuple]) -> 'pd.DataFrame':
+        """Parse COPY CSV output into the dtypes and values read_sql produces for the same columns"""
+        dtypes, converters, parse_dates, aware_columns = {}, {}, [], []
+        for name, type_code in column_types:
+            if type_code in _PG_TEXT_OIDS:
+                # Keep numeric-looking text (e.g. scrip codes) as strings
+                dtypes[name] = str
+            elif type_code == _PG_TIMESTAMP_OID:
+                parse_dates.append(name)
+            elif type_code == _PG_TIMESTAMPTZ_OID:
+                aware_columns.append(name)
+            elif type_code == _PG_DATE_OID:
+                converters[name] = _parse_csv_date
+            elif type_code in _PG_JSON_OIDS:
+                converters[name] = _parse_csv_json
+            elif type_code == _PG_NUMERIC_OID:
+                converters[name] = _parse_csv_numeric
+
+        # COPY writes booleans as t/f and NULL as an empty field
+        df = pd.read_csv(
+            buffer,
+            dtype=dtypes,
+            converters=converters,
+            parse_dates=parse_dates,
+            true_values=['t'],
+            false_values=['f']
+        )
+
+        # Offsets follow the session time zone; normalizing to UTC keeps one datetime64 dtype per column
+        for name in aware_columns:
+            df[name] = pd.to_datetime(df[name], utc=True)
+
+        return df
 
     def get_statistics(self) -> Dict:
         """Get processing statistics"""
@@ -463,6 +869,9 @@ if __name__ == "__main__":
         # Test basic operations
         print("✅ Database connection established")
 
+        # Make sure read-path indexes exist
+        db_manager.create_indexes()
+
         # Get database statistics
         stats = db_manager.get_database_stats()
         print(f"📊 Database Statistics: {stats}")
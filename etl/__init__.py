@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 """
 Python package for financial data etl
+
+FinancialDataProcessor.process_announcements returns plain dicts, as it always has.
+ProcessedAnnouncement is the slotted record the processor builds them from; it is
+exported for code that wants the typed fields and converts with to_dict().
 """
 
-from etl.financial_data_processor import FinancialDataProcessor
+from etl.financial_data_processor import FinancialDataProcessor, ProcessedAnnouncement
 from etl.minio_client import BSEPDFStorage
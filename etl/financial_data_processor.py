@@ -4,14 +4,18 @@ Financial Data Processor - PDF and XBRL Handler
 Focuses on extracting structured data from BSE announcements
 """
 
-import json
+import asyncio
 import logging
 import re
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-import requests
+import orjson
 
 from etl.minio_client import BSEPDFStorage
 from database.database_manager import BSEDatabaseManager
@@ -19,25 +23,116 @@ from database.database_manager import BSEDatabaseManager
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-db_client = BSEDatabaseManager()
+
+@lru_cache(maxsize=1)
+def _db() -> BSEDatabaseManager:
+    """Shared database manager, connected on first use rather than at import time"""
+    return BSEDatabaseManager()
+
+
+# "<quarter|year|period> ended dd.mm.yyyy" in one scan; when several appear the kind decides
+_PERIOD_ENDED_PATTERN = re.compile(r'(quarter|year|period) ended (\d{2}\.\d{2}\.\d{4})', re.IGNORECASE)
+_PERIOD_ENDED_PRIORITY = {'quarter': 0, 'year': 1, 'period': 2}
+
+# Looser period patterns, tried in order only when no explicit end date is present
+_PERIOD_FALLBACK_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'q[1-4].*?(\d{4})',
+    r'fy.*?(\d{4})'
+))
+
+_FY_PATTERN = re.compile(r'fy.*?(\d{4})', re.IGNORECASE)
+
+# Categories that are financial whatever their subject says
+_RESULT_CATEGORIES = frozenset({'Result', 'Results'})
+
+# Result-type and audit-status markers, reported by the same keyword scan as the detection keywords
+_MARKERS = ('unaudited', 'audited', 'consolidated', 'standalone')
+
+_DIGIT_PATTERN = re.compile(r'\d')
+
+# Shortest texts the extractors can match at all ('q1') and with a dated period or FY ('fy2025').
+# Anything shorter, such as a blank subject with no MORE text, skips the regex scans.
+_MIN_TEXT = 2
+_MIN_DATED_TEXT = 6
+
+# Batches at least this large are pre-filtered with pandas before the per-announcement loop
+_VECTORIZE_THRESHOLD = 2000
+
+# All quarter notations in one alternation, ranked by the group that matched: "Q2" beats
+# "quarter ... 2", which beats "second quarter". The gap after "quarter" is bounded and digit-free so
+# a miss costs one linear scan, (?!\d) keeps dates such as "30.06.2025" from reading as Q3, and the
+# "quarter ... N" and ordinal forms only look ahead so they never swallow a better match after them.
+_QUARTER_PATTERN = re.compile(
+    r'q(?P<qn>[1-4])(?!\d)'
+    r'|quarter(?=[^\d]{0,30}?(?P<qw>[1-4])(?!\d))'
+    r'|(?P<ord>first|second|third|fourth)(?= quarter)',
+    re.IGNORECASE
+)
+_QUARTER_RANKS = {'qn': 0, 'qw': 1, 'ord': 2}
+_QUARTER_WORDS = {'first': 'Q1', 'second': 'Q2', 'third': 'Q3', 'fourth': 'Q4'}
+
+
+def _field_text(announcement: Dict, key: str) -> str:
+    """Read a field as text; missing and None both read as '', as fillna('') does on the pandas path"""
+    value = announcement.get(key)
+    return '' if value is None else str(value)
+
+
+@dataclass(slots=True)
+class ProcessedAnnouncement:
+    """
+    Working record for one financial announcement inside FinancialDataProcessor.
+
+    The public methods still hand out plain dicts (see to_dict), so callers can mutate, copy
+    and json.dumps them as before.
+    """
+    symbol: str
+    company: str
+    category: str
+    subject: str
+    date: Optional[datetime]
+    attachment_name: str
+    confidence: str
+    extracted_data: Optional[Dict] = None
+    pdf_url: Optional[str] = None
+    processing_status: str = 'pending'
+    pdf_stored: Optional[bool] = None
+    minio_path: Optional[str] = None
+
+    def __getitem__(self, key: str) -> Any:
+        """Mapping-style access so callers written against the old dict records keep working"""
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """dict.get counterpart of __getitem__"""
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of every field, in declaration order"""
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
 # noinspection PyTypeChecker
 class FinancialDataProcessor:
     """Realistic processor for BSE financial announcements"""
 
-    def __init__(self, download_dir: str = "./downloads", cache_dir: str = "./cache"):
-        self.download_dir = Path(download_dir)
+    def __init__(self, download_dir: Optional[str] = None, cache_dir: str = "./cache", *,
+                 max_concurrent_downloads: int = 5):
+        # PDFs go straight to MinIO; download_dir keeps its position so existing callers still bind
+        # cache_dir correctly, but nothing is written there any more
+        if download_dir is not None:
+            warnings.warn(
+                "FinancialDataProcessor's download_dir is unused and will be removed",
+                DeprecationWarning,
+                stacklevel=2
+            )
+
         self.cache_dir = Path(cache_dir)
-        self.download_dir.mkdir(exist_ok=True)
         self.cache_dir.mkdir(exist_ok=True)
 
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/pdf, application/xml, */*'
-        })
-
         self.bse_attachment_dir = "https://www.bseindia.com/xml-data/corpfiling"
         self.bse_attachment_live = f"{self.bse_attachment_dir}/AttachLive"
         self.bse_attachment_moved = f"{self.bse_attachment_dir}/AttachHis"
@@ -49,6 +144,21 @@ class FinancialDataProcessor:
             'board_keywords': ['approve', 'consideration', 'quarter ended', 'year ended']
         }
 
+        # Keyword lists as sets, checked against the keywords found in a subject
+        self._high_confidence_keywords = frozenset(self.financial_keywords['high_confidence'])
+        self._board_keywords = frozenset(self.financial_keywords['board_keywords'])
+
+        # One compiled alternation per keyword list: a single scan instead of an `in` check per keyword
+        self._high_confidence_pattern = re.compile(
+            '|'.join(map(re.escape, self.financial_keywords['high_confidence']))
+        )
+        self._board_pattern = re.compile('|'.join(map(re.escape, self.financial_keywords['board_keywords'])))
+
+        # Every detection keyword and marker in one pass. The alternation sits in a lookahead so each
+        # position is tried, reporting overlapping keywords ('audited' inside 'unaudited') as well
+        vocabulary = sorted({kw for kws in self.financial_keywords.values() for kw in kws} | set(_MARKERS))
+        self._keyword_pattern = re.compile(f"(?=({'|'.join(map(re.escape, vocabulary))}))", re.IGNORECASE)
+
         self.stats = {
             'processed': 0,
             'financial_announcements': 0,
@@ -58,6 +168,12 @@ class FinancialDataProcessor:
             'extraction_failed': 0
         }
 
+        # PDF downloads in flight at once; BSEPDFStorage still spaces out the actual requests
+        self.max_concurrent_downloads = max_concurrent_downloads
+
+        # (symbol, filing_date, minio_path, pdf_stored) rows written back in one batch per run
+        self._pending_status_updates: List[tuple] = []
+
         # Add MinIO storage
         self.pdf_storage = BSEPDFStorage()
         logger.info("MinIO PDF storage initialized")
@@ -66,6 +182,26 @@ class FinancialDataProcessor:
         """
         Process BSE announcements to extract financial data
 
+        Args:
+            anns: List of BSE announcement dictionaries
+
+        Returns:
+            List of processed financial data
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.process_announcements_async(anns))
+
+        # asyncio.run cannot nest inside a running loop (Jupyter, async callers), so the batch gets
+        # its own loop on a worker thread; async code should await process_announcements_async instead
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.process_announcements_async(anns)).result()
+
+    async def process_announcements_async(self, anns: List[Dict]) -> List[Dict]:
+        """
+        Async variant of process_announcements; PDF downloads run concurrently
+
         Args:
             anns: List of BSE announcement dictionaries
 
@@ -75,146 +211,237 @@ class FinancialDataProcessor:
         logger.info(f"Processing {len(anns)} BSE announcements for financial data")
 
         finance_data = []
+        pdf_jobs = []
+        extracted = 0
 
-        for announcement in anns:
-            self.stats['processed'] += 1
+        candidates = self._financial_candidates(anns)
+        records = [self._classify(*candidate) for candidate in candidates]
 
-            # Extract announcement details with null handling
-            category = str(announcement.get('CATEGORYNAME', '')).strip()
-            subject = str(announcement.get('NEWSSUB', '')).lower()
-            company = announcement.get('SLONGNAME', '')
-            symbol = str(announcement.get('SCRIP_CD', ''))
-            date = announcement.get('NEWS_DT', '')
-            attachment = announcement.get('ATTACHMENTNAME', '')
-            year, month = date[:4], date[5:7]
+        for (announcement, _, _), processed_data in zip(candidates, records):
 
             # Focus on financial announcements
-            if self._is_financial_announcement(category, subject):
-                self.stats['financial_announcements'] += 1
-
-                processed_data = {
-                    'symbol': symbol,
-                    'company': company,
-                    'category': category,
-                    'subject': announcement.get('NEWSSUB', ''),
-                    'date': db_client.parse_iso_datetime(date),
-                    'attachment_name': attachment,
-                    'confidence': self._determine_confidence(category, subject),
-                    'extracted_data': None,
-                    'pdf_url': None,
-                    'processing_status': 'pending'
-                }
-
-                # Try to extract financial data
-                if attachment:
-                    pdf_url = f"{self.bse_attachment_live}/{attachment}"
-                    processed_data['pdf_url'] = pdf_url
-
-                    # Download and store PDF in MinIO
-                    minio_path = self.pdf_storage.download_and_store_pdf(pdf_url, symbol, date)
-                    if minio_path.lower() == "pdf moved":
-                        pdf_url = f"{self.bse_attachment_moved}/{year}/{month}/{attachment}"
-                        minio_path = self.pdf_storage.download_and_store_pdf(pdf_url, symbol, date)
-
-                    if minio_path:
-                        processed_data['pdf_stored'] = True
-                        logger.info(f"PDF stored in MinIO: {company} ({symbol})")
-                    else:
-                        processed_data['pdf_stored'] = False
-                        logger.warning(f"Failed to store PDF: {company} ({symbol})")
-
-                    processed_data['minio_path'] = minio_path
-                    self.updated_pdf_status(
-                        symbol, processed_data['date'], processed_data['minio_path'], processed_data['pdf_stored']
-                    )
-
-                    # Extract basic financial information from announcement text
-                    extracted_info = self._extract_financial_info_from_text(announcement)
-                    if extracted_info:
-                        processed_data['extracted_data'] = extracted_info
-                        processed_data['processing_status'] = 'success'
-                        self.stats['extraction_successful'] += 1
-                        logger.info(f"Extracted financial data: {company} ({symbol})")
-                    else:
-                        processed_data['processing_status'] = 'no_data_found'
-                        self.stats['extraction_failed'] += 1
-
-                finance_data.append(processed_data)
+            if processed_data is None:
+                continue
+
+            if processed_data.pdf_url:
+                # Download and store PDF in MinIO once all announcements are classified
+                pdf_jobs.append((processed_data, announcement.get('NEWS_DT', '')))
+
+                if processed_data.processing_status == 'success':
+                    extracted += 1
+                    # Per-row detail at DEBUG with lazy arguments; the batch summary below stays at INFO
+                    logger.debug("Extracted financial data: %s (%s)", processed_data.company, processed_data.symbol)
+
+            finance_data.append(processed_data)
+
+        # Counted once per batch: every record with a PDF job went through extraction
+        self.stats['processed'] += len(anns)
+        self.stats['financial_announcements'] += len(finance_data)
+        self.stats['extraction_successful'] += extracted
+        self.stats['extraction_failed'] += len(pdf_jobs) - extracted
+
+        if pdf_jobs:
+            semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
+            await asyncio.gather(*(
+                self._store_pdf_async(semaphore, processed_data, date) for processed_data, date in pdf_jobs
+            ))
+            await asyncio.to_thread(self._flush_status_updates)
 
         logger.info(f"Financial processing complete:")
         logger.info(f"  Financial announcements: {self.stats['financial_announcements']}")
         logger.info(f"  Successful extractions: {self.stats['extraction_successful']}")
         logger.info(f"  Failed extractions: {self.stats['extraction_failed']}")
 
-        return finance_data
+        return [processed_data.to_dict() for processed_data in finance_data]
+
+    def _classify(self, announcement: Dict, category: str, subject: str) -> Optional[ProcessedAnnouncement]:
+        """Build the processed record for one announcement, or return None when it is not financial"""
+
+        # Extract announcement details with null handling
+        # Ticker-only rows often have no subject at all; there is nothing to scan then
+        keywords = self._find_keywords(subject, is_lower=True) if subject else set()
+        if not self._is_financial_announcement(category, keywords):
+            return None
+
+        attachment = announcement.get('ATTACHMENTNAME', '')
+        processed_data = ProcessedAnnouncement(
+            symbol=str(announcement.get('SCRIP_CD', '')),
+            company=announcement.get('SLONGNAME', ''),
+            category=category,
+            subject=announcement.get('NEWSSUB', ''),
+            date=BSEDatabaseManager.parse_iso_datetime(announcement.get('NEWS_DT', '')),
+            attachment_name=attachment,
+            confidence=self._determine_confidence(category, keywords)
+        )
+
+        # Try to extract financial data
+        if attachment:
+            processed_data.pdf_url = f"{self.bse_attachment_live}/{attachment}"
+
+            # Extract basic financial information from announcement text
+            extracted_info = self._extract_financial_info_from_text(announcement, subject, keywords)
+            if extracted_info:
+                processed_data.extracted_data = extracted_info
+                processed_data.processing_status = 'success'
+            else:
+                processed_data.processing_status = 'no_data_found'
+
+        return processed_data
+
+    def _financial_candidates(self, anns: List[Dict]) -> List[Tuple[Dict, str, str]]:
+        """
+        Pair each announcement with its stripped category and lowered subject.
+
+        Large batches are normalized and narrowed to the announcements _is_financial_announcement
+        would accept with vectorized pandas string operations, so the per-row loop only visits the
+        (usually small) financial subset. Small batches are normalized row by row and not filtered.
+        Both branches read a missing or None field as '', so the candidates never depend on the
+        batch size.
+        """
+        if len(anns) < _VECTORIZE_THRESHOLD:
+            return [
+                (announcement,
+                 _field_text(announcement, 'CATEGORYNAME').strip(),
+                 _field_text(announcement, 'NEWSSUB').lower())
+                for announcement in anns
+            ]
+
+        import pandas as pd
+
+        df = pd.DataFrame(anns, dtype=object).reindex(columns=['CATEGORYNAME', 'NEWSSUB'])
+        category = df['CATEGORYNAME'].fillna('').astype(str).str.strip()
+        subject = df['NEWSSUB'].fillna('').astype(str).str.lower()
+
+        is_result = category.isin(_RESULT_CATEGORIES)
+        is_board = category == 'Board Meeting'
+        is_financial = (
+            is_result
+            | (is_board & subject.str.contains(self._board_pattern))
+            | (~is_result & ~is_board & subject.str.contains(self._high_confidence_pattern))
+        ).to_numpy()
+
+        return [
+            (announcement, announcement_category, announcement_subject)
+            for announcement, announcement_category, announcement_subject, keep
+            in zip(anns, category.tolist(), subject.tolist(), is_financial)
+            if keep
+        ]
+
+    async def _store_pdf_async(self, semaphore: asyncio.Semaphore, processed_data: ProcessedAnnouncement,
+                               date: str):
+        """Download one announcement PDF into MinIO off the event loop and record the outcome"""
+        async with semaphore:
+            minio_path = await asyncio.to_thread(self._store_pdf, processed_data, date)
+
+        symbol, company = processed_data.symbol, processed_data.company
+        if minio_path:
+            processed_data.pdf_stored = True
+            logger.info(f"PDF stored in MinIO: {company} ({symbol})")
+        else:
+            processed_data.pdf_stored = False
+            logger.warning(f"Failed to store PDF: {company} ({symbol})")
+
+        processed_data.minio_path = minio_path
+        self._pending_status_updates.append(
+            (symbol, processed_data.date, processed_data.minio_path, processed_data.pdf_stored)
+        )
+
+    def _store_pdf(self, processed_data: ProcessedAnnouncement, date: str) -> Optional[str]:
+        """Store the announcement PDF, falling back to BSE's archive location when it has moved"""
+        symbol, attachment = processed_data.symbol, processed_data.attachment_name
+
+        minio_path = self.pdf_storage.download_and_store_pdf(processed_data.pdf_url, symbol, date)
+        if minio_path and minio_path.lower() == "pdf moved":
+            year, month = date[:4], date[5:7]
+            pdf_url = f"{self.bse_attachment_moved}/{year}/{month}/{attachment}"
+            minio_path = self.pdf_storage.download_and_store_pdf(pdf_url, symbol, date)
+
+        return minio_path
+
+    def _flush_status_updates(self):
+        """Write all PDF statuses collected during a run to the announcements table in one batch"""
+        updates, self._pending_status_updates = self._pending_status_updates, []
+        _db().update_pdf_statuses(updates)
 
     @staticmethod
     def updated_pdf_status(symbol, filing_date, minio_path: str, pdf_stored: bool):
         """
         Update minio_path and pdf_stored status in BSE Announcements table
 
+        Deprecated: process_announcements writes all statuses of a run in one batch; use
+        BSEDatabaseManager.update_pdf_statuses directly for ad-hoc updates.
+
         Args:
             symbol: Financial announcements symbol
             filing_date: Financial announcements filing date
             minio_path: Path for PDF to minio bucket
             pdf_stored: Boolean flag to indicate whether the PDF stored successfully
         """
-        with db_client.get_connection() as conn:
-            with conn.cursor() as cursor:
-                try:
-                    # Use ON CONFLICT to handle duplicates
-                    update_query = """
-                    UPDATE announcements
-                        SET minio_path = %s, pdf_stored = %s
-                        WHERE symbol = %s AND filing_date = %s;
-                    """
-
-                    cursor.execute(update_query, (minio_path, pdf_stored, symbol, filing_date))
-
-                    conn.commit()
-                    logger.info(f"Successfully updated minio_path in announcements")
-
-                except Exception as e:
-                    conn.rollback()
-                    logger.error(f"Failed to update minio_path: {e}")
-                    raise
-
-    def _is_financial_announcement(self, category: str, subject: str) -> bool:
-        """Determine if announcement is financial-related"""
+        warnings.warn(
+            "updated_pdf_status is deprecated; use BSEDatabaseManager.update_pdf_statuses",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        _db().update_pdf_statuses([(symbol, filing_date, minio_path, pdf_stored)])
+
+    def _find_keywords(self, text: str, is_lower: bool = False) -> Set[str]:
+        """Return every detection keyword and marker that occurs in the text, lowercased"""
+        found = set(self._keyword_pattern.findall(text))
+        # Matches in already lowered text (the subject) are lowercase as found
+        return found if is_lower else {keyword.lower() for keyword in found}
+
+    def _is_financial_announcement(self, category: str, keywords: Set[str]) -> bool:
+        """Determine if announcement is financial-related from the keywords found in its subject"""
 
         # High confidence categories
-        if category in ['Result', 'Results']:
+        if category in _RESULT_CATEGORIES:
             return True
 
         # Board meetings with financial keywords
         if category == 'Board Meeting':
-            return any(keyword in subject for keyword in self.financial_keywords['board_keywords'])
+            return not keywords.isdisjoint(self._board_keywords)
 
         # Subject-based detection
-        return any(keyword in subject for keyword in self.financial_keywords['high_confidence'])
+        return not keywords.isdisjoint(self._high_confidence_keywords)
 
-    def _determine_confidence(self, category: str, subject: str) -> str:
+    def _determine_confidence(self, category: str, keywords: Set[str]) -> str:
         """Determine confidence level for financial data"""
         if category == 'Result':
             return 'HIGH'
-        elif category == 'Board Meeting' and any(kw in subject for kw in self.financial_keywords['board_keywords']):
+        elif category == 'Board Meeting' and not keywords.isdisjoint(self._board_keywords):
             return 'MEDIUM'
         else:
             return 'LOW'
 
-    def _extract_financial_info_from_text(self, announcement: Dict) -> Optional[Dict]:
-        """Extract financial information from announcement text"""
+    def _extract_financial_info_from_text(self, announcement: Dict, subject_lower: Optional[str] = None,
+                                          subject_keywords: Optional[Set[str]] = None) -> Optional[Dict]:
+        """Extract financial information from announcement text, reusing an already scanned subject"""
         try:
-            subject = announcement.get('NEWSSUB', '')
-            more_text = announcement.get('MORE', '')
-            full_text = f"{subject} {more_text}".lower()
+            if subject_lower is None:
+                subject_lower = _field_text(announcement, 'NEWSSUB').lower()
+            if subject_keywords is None:
+                subject_keywords = self._find_keywords(subject_lower, is_lower=True)
+            more = _field_text(announcement, 'MORE')
+            text_length = len(subject_lower) + len(more)
+            if text_length < _MIN_TEXT:
+                return None
+
+            # Every pattern is case-insensitive, so the (possibly long) MORE text is scanned as-is
+            # rather than copied into a lowered string
+            full_text = f"{subject_lower} {more}"
+
+            # The subject has already been scanned, so only the MORE text is left to search
+            markers = subject_keywords | self._find_keywords(more)
+
+            # Period and financial year need a digit (and a few more characters around it) to match
+            has_dates = text_length >= _MIN_DATED_TEXT and _DIGIT_PATTERN.search(full_text) is not None
 
             extracted_info = {
-                'period': self._extract_period(full_text),
-                'type': self._extract_result_type(full_text),
-                'financial_year': self._extract_financial_year(full_text),
+                'period': self._extract_period(full_text) if has_dates else None,
+                'type': self._extract_result_type(markers),
+                'financial_year': self._extract_financial_year(full_text) if has_dates else None,
                 'quarter': self._extract_quarter(full_text),
-                'audit_status': self._extract_audit_status(full_text)
+                'audit_status': self._extract_audit_status(markers)
             }
 
             # Only return if we found meaningful data
@@ -230,85 +457,86 @@ class FinancialDataProcessor:
     @staticmethod
     def _extract_period(text: str) -> Optional[str]:
         """Extract reporting period from text"""
-        period_patterns = [
-            r'quarter ended (\d{2}\.\d{2}\.\d{4})',
-            r'year ended (\d{2}\.\d{2}\.\d{4})',
-            r'period ended (\d{2}\.\d{2}\.\d{4})',
-            r'q[1-4].*?(\d{4})',
-            r'fy.*?(\d{4})'
-        ]
-
-        for pattern in period_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        best_rank, best_period = None, None
+        for match in _PERIOD_ENDED_PATTERN.finditer(text):
+            rank = _PERIOD_ENDED_PRIORITY[match.group(1).lower()]
+            if best_rank is None or rank < best_rank:
+                best_rank, best_period = rank, match.group(2)
+                if rank == 0:
+                    break
+
+        if best_period:
+            return best_period
+
+        for pattern in _PERIOD_FALLBACK_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
 
         return None
 
     @staticmethod
-    def _extract_result_type(text: str) -> Optional[str]:
-        """Extract result type (standalone/consolidated)"""
-        if 'consolidated' in text:
+    def _extract_result_type(markers: Set[str]) -> Optional[str]:
+        """Extract result type (standalone/consolidated) from the markers found in the text"""
+        if 'consolidated' in markers:
             return 'consolidated'
-        elif 'standalone' in text:
+        elif 'standalone' in markers:
             return 'standalone'
         return None
 
     @staticmethod
     def _extract_financial_year(text: str) -> Optional[str]:
         """Extract financial year"""
-        fy_pattern = r'fy.*?(\d{4})'
-        match = re.search(fy_pattern, text, re.IGNORECASE)
+        match = _FY_PATTERN.search(text)
         return match.group(1) if match else None
 
     @staticmethod
     def _extract_quarter(text: str) -> Optional[str]:
         """Extract quarter information"""
-        quarter_patterns = [
-            r'q([1-4])',
-            r'quarter.*?([1-4])',
-            r'first quarter',
-            r'second quarter',
-            r'third quarter',
-            r'fourth quarter'
-        ]
-
-        for pattern in quarter_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                if pattern in ['first quarter']:
-                    return 'Q1'
-                elif pattern in ['second quarter']:
-                    return 'Q2'
-                elif pattern in ['third quarter']:
-                    return 'Q3'
-                elif pattern in ['fourth quarter']:
-                    return 'Q4'
-                else:
-                    return f"Q{match.group(1)}"
-
-        return None
+        best, best_rank = None, len(_QUARTER_RANKS)
+        for match in _QUARTER_PATTERN.finditer(text):
+            rank = _QUARTER_RANKS[match.lastgroup]
+            if rank < best_rank:
+                best, best_rank = match, rank
+                if rank == 0:
+                    break
+
+        if best is None:
+            return None
+        if best.lastgroup == 'ord':
+            return _QUARTER_WORDS[best.group('ord').lower()]
+        return f"Q{best.group(best.lastgroup)}"
 
     @staticmethod
-    def _extract_audit_status(text: str) -> Optional[str]:
-        """Extract audit status"""
-        if 'unaudited' in text:
+    def _extract_audit_status(markers: Set[str]) -> Optional[str]:
+        """Extract audit status from the markers found in the text"""
+        if 'unaudited' in markers:
             return 'unaudited'
-        elif 'audited' in text:
+        elif 'audited' in markers:
             return 'audited'
         return None
 
-    def save_financial_data(self, finance_data: List[Dict]) -> Path:
-        """Save extracted financial data to JSON file"""
+    def save_financial_data(self, finance_data: List[Dict], timestamp: Optional[str] = None) -> Path:
+        """
+        Save extracted financial data to JSON file
+
+        Args:
+            finance_data: Processed financial announcements
+            timestamp: File name timestamp (YYYYMMDD_HHMMSS); pass the crawl's timestamp so the
+                output can be matched to the announcements file it came from. Defaults to now.
+        """
         if not finance_data:
             logger.warning("No financial data to save")
             return None
 
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if timestamp is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_file_path = self.cache_dir / f"financial_data_{timestamp}.json"
 
-        with open(output_file_path, 'w') as file:
-            json.dump(finance_data, file, indent=2, default=str)
+        # Datetimes are passed through to default=str so the file format matches the json.dump output
+        output_file_path.write_bytes(orjson.dumps(
+            finance_data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+        ))
 
         logger.info(f"Financial data saved to: {output_file_path}")
         return output_file_path
@@ -319,5 +547,5 @@ class FinancialDataProcessor:
 
     def close(self):
         """Clean up resources"""
-        self.session.close()
-        logger.info("Financial processor session closed")
+        self.pdf_storage.close()
+        logger.info("Financial processor closed")
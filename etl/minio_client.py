@@ -6,12 +6,14 @@ Handles BSE's 403 protection by mimicking browser behavior
 
 import logging
 import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from io import BytesIO
-from typing import Optional, Dict
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, Set
 
-import requests
+import httpx
 from minio import Minio
 from minio.error import S3Error
 
@@ -25,6 +27,55 @@ from config import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Download chunk size while streaming a PDF into MinIO
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Part size for uploads whose final length is unknown (MinIO's minimum)
+MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
+
+@lru_cache(maxsize=4096)
+def _parse_filing_date(filing_date: str) -> Optional[datetime]:
+    """Parse a filing timestamp for storage paths; memoized since a batch repeats the same timestamps"""
+    try:
+        return datetime.fromisoformat(filing_date.replace('Z', '+00:00'))
+    except Exception:
+        return None
+
+
+class _ResponseStream:
+    """Minimal file-like reader over an HTTP body's chunk iterator, as MinIO's put_object expects"""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        # One growable buffer per stream: chunks are appended in place and consumed from the front
+        # (CPython trims bytearray heads without copying), instead of re-slicing immutable bytes
+        self._buffer = bytearray()
+        self.bytes_read = 0
+
+    def _fill(self, size: int):
+        """Pull chunks until at least `size` bytes are buffered (or the body ends); -1 reads everything"""
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+    def peek(self, size: int) -> bytes:
+        """Return the next `size` bytes without consuming them"""
+        self._fill(size)
+        return bytes(self._buffer[:size])
+
+    def read(self, size: int = -1) -> bytes:
+        """Return up to `size` bytes (all remaining when negative)"""
+        self._fill(size)
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self.bytes_read += len(data)
+        return data
+
 
 class BSEPDFStorage:
     """Enhanced MinIO client with BSE anti-bot protection"""
@@ -43,28 +94,43 @@ class BSEPDFStorage:
             secure=secure
         )
 
-        # Initialize HTTP session with anti-bot headers
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
-                          'Chrome/124.0.0.0 Safari/537.36',
-            'Accept': 'application/pdf,application/octet-stream,*/*;q=0.9',
-            'Accept-Language': 'en-US,en;q=0.9,hi;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'same-origin',
-            'Cache-Control': 'max-age=0'
-        })
+        # Initialize HTTP session with anti-bot headers. HTTP/2 multiplexes concurrent PDF downloads
+        # over one connection to BSE (no Connection header: it is not allowed in HTTP/2).
+        self.session = httpx.Client(
+            http2=True,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                              'Chrome/124.0.0.0 Safari/537.36',
+                'Accept': 'application/pdf,application/octet-stream,*/*;q=0.9',
+                'Accept-Language': 'en-US,en;q=0.9,hi;q=0.8',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'Upgrade-Insecure-Requests': '1',
+                'Sec-Fetch-Dest': 'document',
+                'Sec-Fetch-Mode': 'navigate',
+                'Sec-Fetch-Site': 'same-origin',
+                'Cache-Control': 'max-age=0'
+            }
+        )
 
         self.bucket_name = "bse-pdfs"
         self.bse_base_url = "https://www.bseindia.com"
 
+        # PDF requests carry the announcements page as referer. Set once here rather than per attempt,
+        # since concurrent downloads share this client and its headers.
+        self._pdf_headers = {'Referer': f"{self.bse_base_url}/corporates/ann.html"}
+
         # Rate limiting parameters
         self.last_request_time = 0
         self.min_request_interval = 1.0  # 1 second between requests
+        self._rate_lock = threading.Lock()
+        self._session_lock = threading.Lock()
+
+        # Object paths known to exist, filled per folder prefix from list_objects
+        self._known_paths: Set[str] = set()
+        self._prefetched_prefixes: Set[str] = set()
+        self._known_paths_lock = threading.Lock()
 
         self.stats = {
             'uploaded': 0,
@@ -73,12 +139,18 @@ class BSEPDFStorage:
             'session_initialized': False
         }
 
+        # Warm up the BSE session in the background so the first download does not pay for the
+        # homepage round trips, while callers that only touch MinIO never wait on BSE
+        self._warmup_executor = ThreadPoolExecutor(max_workers=1)
+        self._session_warmup = self._warmup_executor.submit(self._initialize_bse_session)
+
         # Verify MinIO connection
         try:
             self.client.bucket_exists(self.bucket_name)
             logger.info(f"Connected to MinIO - bucket '{self.bucket_name}' ready")
         except Exception as e:
             logger.error(f"MinIO connection failed: {e}")
+            self.close()
             raise
 
     def _initialize_bse_session(self):
@@ -86,53 +158,58 @@ class BSEPDFStorage:
         if self.stats['session_initialized']:
             return True
 
-        try:
-            logger.info("Initializing BSE session...")
+        # Concurrent downloads share one session; only the first caller performs the warm-up
+        with self._session_lock:
+            if self.stats['session_initialized']:
+                return True
 
-            # Visit BSE homepage to establish session
-            homepage_response = self.session.get(
-                f"{self.bse_base_url}/",
-                timeout=30
-            )
+            try:
+                logger.info("Initializing BSE session...")
 
-            if homepage_response.status_code == 200:
-                # Visit announcements page to get additional cookies
-                self.session.get(
-                    f"{self.bse_base_url}/corporates/ann.html",
+                # Visit BSE homepage to establish session
+                homepage_response = self.session.get(
+                    f"{self.bse_base_url}/",
                     timeout=30
                 )
 
-                self.stats['session_initialized'] = True
-                logger.info("BSE session initialized successfully")
-                time.sleep(2)  # Human-like delay
-                return True
-            else:
-                logger.error(f"Failed to initialize BSE session: {homepage_response.status_code}")
-                return False
+                if homepage_response.status_code == 200:
+                    # Visit announcements page to get additional cookies
+                    self.session.get(
+                        f"{self.bse_base_url}/corporates/ann.html",
+                        timeout=30
+                    )
 
-        except Exception as e:
-            logger.error(f"BSE session initialization error: {e}")
-            return False
+                    self.stats['session_initialized'] = True
+                    logger.info("BSE session initialized successfully")
+                    time.sleep(2)  # Human-like delay
+                    return True
+                else:
+                    logger.error(f"Failed to initialize BSE session: {homepage_response.status_code}")
+                    return False
+
+            except Exception as e:
+                logger.error(f"BSE session initialization error: {e}")
+                return False
 
     def _rate_limit(self):
         """Enforce rate limiting to avoid triggering anti-bot measures"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
+        # Reserve the next slot under the lock so concurrent downloads stay spaced out
+        with self._rate_lock:
+            current_time = time.time()
+            slot = max(current_time, self.last_request_time + self.min_request_interval)
+            self.last_request_time = slot
+
+        sleep_time = slot - current_time
+        if sleep_time > 0:
             time.sleep(sleep_time)
 
-        self.last_request_time = time.time()
-
     @staticmethod
     def generate_pdf_path(symbol: str, filing_date: str, confidence: str) -> str:
         """Generate organized path for PDF storage"""
-        try:
-            date_obj = datetime.fromisoformat(filing_date.replace('Z', '+00:00'))
-        except Exception as e:
+        date_obj = _parse_filing_date(filing_date)
+        if date_obj is None:
             # Fallback for different date formats
-            logger.warning(f"Falling back to different time format: {e}")
+            logger.warning(f"Falling back to different time format: unparseable filing date {filing_date!r}")
             date_obj = datetime.now()
 
         year = date_obj.strftime('%Y')
@@ -156,7 +233,8 @@ class BSEPDFStorage:
                                max_retries: int = 3) -> Optional[str]:
         """Download PDF from BSE with anti-bot protection and store in MinIO"""
 
-        # Initialize BSE session if needed
+        # Wait for the background warm-up on first use, then retry it here if it failed
+        self._session_warmup.result()
         if not self._initialize_bse_session():
             logger.error("Failed to initialize BSE session")
             self.stats['failed'] += 1
@@ -177,67 +255,73 @@ class BSEPDFStorage:
                 # Rate limiting
                 self._rate_limit()
 
-                # Set referer to BSE announcements page
-                self.session.headers['Referer'] = f"{self.bse_base_url}/corporates/ann.html"
-
                 # Download PDF with proper headers
                 logger.info(f"Downloading PDF (attempt {attempt + 1}/{max_retries}): {symbol}")
-                response = self.session.get(pdf_url, timeout=45, stream=True)
-
-                # Check response status
-                if response.status_code == 200:
-                    # Verify content type
-                    content_type = response.headers.get('content-type', '').lower()
-                    if 'pdf' not in content_type and 'application/octet-stream' not in content_type:
-                        logger.warning(f"Unexpected content type: {content_type} for {pdf_url}")
-                        # Continue anyway as BSE sometimes returns generic content-type
-
-                    # Read content
-                    pdf_content = response.content
-
-                    # Basic PDF validation (check PDF header)
-                    if not pdf_content.startswith(b'%PDF'):
-                        logger.warning(f"Downloaded content doesn't appear to be a PDF: {symbol}")
+                with self.session.stream('GET', pdf_url, headers=self._pdf_headers, timeout=45) as response:
+
+                    # Check response status
+                    if response.status_code == 200:
+                        # Verify content type
+                        content_type = response.headers.get('content-type', '').lower()
+                        if 'pdf' not in content_type and 'application/octet-stream' not in content_type:
+                            logger.warning(f"Unexpected content type: {content_type} for {pdf_url}")
+                            # Continue anyway as BSE sometimes returns generic content-type
+
+                        # Read only enough of the body to check the PDF header
+                        pdf_stream = _ResponseStream(response.iter_bytes(chunk_size=UPLOAD_CHUNK_SIZE))
+
+                        # Basic PDF validation (check PDF header)
+                        if not pdf_stream.peek(4).startswith(b'%PDF'):
+                            logger.warning(f"Downloaded content doesn't appear to be a PDF: {symbol}")
+                            if attempt < max_retries - 1:
+                                time.sleep(random.uniform(2, 5))
+                                continue
+
+                        # Stream the body straight into MinIO. Content-Length is only the object size
+                        # when the body is not content-encoded; otherwise upload in 5 MiB parts.
+                        content_length = response.headers.get('Content-Length')
+                        if content_length and not response.headers.get('Content-Encoding'):
+                            length, part_size = int(content_length), 0
+                        else:
+                            length, part_size = -1, MULTIPART_PART_SIZE
+
+                        self.client.put_object(
+                            bucket_name=self.bucket_name,
+                            object_name=minio_path,
+                            data=pdf_stream,
+                            length=length,
+                            part_size=part_size,
+                            content_type='application/pdf'
+                        )
+
+                        with self._known_paths_lock:
+                            self._known_paths.add(minio_path)
+
+                        self.stats['uploaded'] += 1
+                        logger.info(f"PDF uploaded successfully: {minio_path} ({pdf_stream.bytes_read} bytes)")
+                        return minio_path
+
+                    elif response.status_code == 403:
+                        logger.warning(f"403 Forbidden (attempt {attempt + 1}): {pdf_url}")
                         if attempt < max_retries - 1:
-                            time.sleep(random.uniform(2, 5))
+                            # Reinitialize session and wait longer
+                            self.stats['session_initialized'] = False
+                            wait_time = random.uniform(5, 15) * (attempt + 1)
+                            logger.info(f"Waiting {wait_time:.1f} seconds before retry...")
+                            time.sleep(wait_time)
                             continue
 
-                    # Upload to MinIO
-                    pdf_data = BytesIO(pdf_content)
-
-                    self.client.put_object(
-                        bucket_name=self.bucket_name,
-                        object_name=minio_path,
-                        data=pdf_data,
-                        length=len(pdf_content),
-                        content_type='application/pdf'
-                    )
-
-                    self.stats['uploaded'] += 1
-                    logger.info(f"PDF uploaded successfully: {minio_path} ({len(pdf_content)} bytes)")
-                    return minio_path
+                    elif response.status_code == 404:
+                        logger.error(f"PDF not found (404): {pdf_url}")
+                        return "PDF Moved"  # No point retrying 404s
 
-                elif response.status_code == 403:
-                    logger.warning(f"403 Forbidden (attempt {attempt + 1}): {pdf_url}")
-                    if attempt < max_retries - 1:
-                        # Reinitialize session and wait longer
-                        self.stats['session_initialized'] = False
-                        wait_time = random.uniform(5, 15) * (attempt + 1)
-                        logger.info(f"Waiting {wait_time:.1f} seconds before retry...")
-                        time.sleep(wait_time)
-                        continue
-
-                elif response.status_code == 404:
-                    logger.error(f"PDF not found (404): {pdf_url}")
-                    return "PDF Moved"  # No point retrying 404s
-
-                else:
-                    logger.warning(f"HTTP {response.status_code} (attempt {attempt + 1}): {pdf_url}")
-                    if attempt < max_retries - 1:
-                        time.sleep(random.uniform(2, 5))
-                        continue
+                    else:
+                        logger.warning(f"HTTP {response.status_code} (attempt {attempt + 1}): {pdf_url}")
+                        if attempt < max_retries - 1:
+                            time.sleep(random.uniform(2, 5))
+                            continue
 
-            except requests.exceptions.Timeout:
+            except httpx.TimeoutException:
                 logger.warning(f"Timeout (attempt {attempt + 1}): {pdf_url}")
                 if attempt < max_retries - 1:
                     time.sleep(random.uniform(3, 8))
@@ -256,11 +340,21 @@ class BSEPDFStorage:
 
     def _pdf_exists(self, minio_path: str) -> bool:
         """Check if PDF already exists in MinIO"""
-        try:
-            self.client.stat_object(self.bucket_name, minio_path)
-            return True
-        except S3Error:
-            return False
+        # One listing per folder replaces a stat_object round trip per PDF
+        prefix = minio_path.rsplit('/', 1)[0] + '/'
+        with self._known_paths_lock:
+            if prefix not in self._prefetched_prefixes:
+                try:
+                    self._known_paths.update(
+                        obj.object_name
+                        for obj in self.client.list_objects(self.bucket_name, prefix=prefix, recursive=False)
+                    )
+                    self._prefetched_prefixes.add(prefix)
+                except S3Error as e:
+                    logger.warning(f"Failed to list MinIO prefix {prefix}: {e}")
+                    return False
+
+            return minio_path in self._known_paths
 
     def get_pdf_url(self, minio_path: str, expires_hours: int = 24) -> Optional[str]:
         """Generate presigned URL for PDF access"""
@@ -289,6 +383,8 @@ class BSEPDFStorage:
 
     def close(self):
         """Clean up resources"""
+        if hasattr(self, '_warmup_executor'):
+            self._warmup_executor.shutdown(wait=False, cancel_futures=True)
         if hasattr(self, 'session'):
             self.session.close()
         logger.info("BSE PDF storage session closed")
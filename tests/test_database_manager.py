@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for BSEDatabaseManager: the COPY CSV export must yield the same column dtypes as the
+pandas.read_sql path it replaced, and the batch-size dependent insert paths must prepare
+announcements identically.
+"""
+
+import io
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('psycopg2')
+
+from database import BSEDatabaseManager
+
+# (column, PostgreSQL type OID) as cursor.description reports them
+COLUMN_TYPES = [
+    ('id', 23),
+    ('symbol', 1043),
+    ('filing_date', 1184),
+    ('fy_end', 1082),
+    ('raw_json', 3802),
+    ('revenue', 1700),
+    ('pdf_stored', 16),
+    ('updated_at', 1114)
+]
+
+# Two rows as COPY ... TO STDOUT WITH CSV HEADER writes them
+COPY_CSV = (
+    'id,symbol,filing_date,fy_end,raw_json,revenue,pdf_stored,updated_at\n'
+    '1,500325,2025-07-25 10:15:00+05:30,2025-03-31,"{""quarter"": ""Q1""}",12.50,t,2025-07-25 10:15:00\n'
+    '2,500400,2025-07-25 11:15:00+05:30,,,,f,\n'
+)
+
+# The same rows as psycopg2 returns them to read_sql
+IST = timezone(timedelta(hours=5, minutes=30))
+READ_SQL_ROWS = [
+    (1, '500325', datetime(2025, 7, 25, 10, 15, tzinfo=IST), date(2025, 3, 31), {'quarter': 'Q1'},
+     Decimal('12.50'), True, datetime(2025, 7, 25, 10, 15)),
+    (2, '500400', datetime(2025, 7, 25, 11, 15, tzinfo=IST), None, None, None, False, None)
+]
+
+
+def _dtype_kinds(df):
+    return {column: df[column].dtype.kind for column in df.columns}
+
+
+def test_copy_csv_matches_read_sql_dtypes():
+    exported = BSEDatabaseManager._read_copy_csv(pd, io.StringIO(COPY_CSV), COLUMN_TYPES)
+    expected = pd.DataFrame.from_records(READ_SQL_ROWS, columns=[name for name, _ in COLUMN_TYPES])
+
+    assert list(exported.columns) == list(expected.columns)
+    assert _dtype_kinds(exported) == _dtype_kinds(expected)
+
+
+def test_copy_csv_restores_values():
+    exported = BSEDatabaseManager._read_copy_csv(pd, io.StringIO(COPY_CSV), COLUMN_TYPES)
+    first = exported.iloc[0]
+
+    assert first['symbol'] == '500325'
+    assert first['filing_date'] == pd.Timestamp('2025-07-25 04:45:00', tz='UTC')
+    assert first['fy_end'] == date(2025, 3, 31)
+    assert first['raw_json'] == {'quarter': 'Q1'}
+    assert first['revenue'] == Decimal('12.50')
+    assert exported['pdf_stored'].tolist() == [True, False]
+    assert exported.iloc[1]['raw_json'] is None
+
+
+@pytest.fixture(scope='module')
+def db_manager():
+    try:
+        manager = BSEDatabaseManager()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+    yield manager
+    manager.close()
+
+
+@pytest.mark.parametrize('table', ['announcements', 'financial_snapshots'])
+def test_export_matches_read_sql_dtypes(db_manager, table):
+    exported = db_manager.export_to_dataframe(table, limit=500)
+    with db_manager.get_connection() as conn:
+        expected = pd.read_sql_query(f"SELECT * FROM {table} LIMIT 500", conn)
+
+    assert list(exported.columns) == list(expected.columns)
+    if not expected.empty:
+        assert _dtype_kinds(exported) == _dtype_kinds(expected)
+
+
+# Category spellings whose confidence must not depend on which insert path a batch takes
+CONFIDENCE_CATEGORIES = ['Result', 'Result ', ' Board Meeting', 'Board Meeting', 'AGM/EGM', '', None]
+
+
+def _confidence_announcements():
+    return [
+        {'SCRIP_CD': f'TEST{i:04d}', 'SLONGNAME': 'Test Co', 'NEWS_DT': '2025-07-25T10:15:00',
+         'CATEGORYNAME': category, 'NEWSSUB': 'Financial Results', 'NEWSID': str(i)}
+        for i, category in enumerate(CONFIDENCE_CATEGORIES)
+    ]
+
+
+def _row_path_confidence(announcements):
+    manager = BSEDatabaseManager.__new__(BSEDatabaseManager)
+    return {row['symbol']: row['confidence'] for row in map(manager._prepare_announcement_data, announcements)}
+
+
+def test_confidence_same_on_row_and_vectorized_paths():
+    announcements = _confidence_announcements()
+    vectorized = {row['symbol']: row['confidence']
+                  for row in BSEDatabaseManager._prepare_announcements_batch(announcements)}
+
+    assert vectorized == _row_path_confidence(announcements)
+    assert vectorized['TEST0001'] == 'HIGH'
+    assert vectorized['TEST0002'] == 'MEDIUM'
+
+
+def test_confidence_same_on_copy_path(db_manager):
+    announcements = _confidence_announcements()
+    manager = BSEDatabaseManager.__new__(BSEDatabaseManager)
+    rows = [manager._prepare_announcement_data(announcement) for announcement in announcements]
+
+    with db_manager.get_connection() as conn:
+        try:
+            with conn.cursor() as cursor:
+                db_manager._bulk_copy_announcements(cursor, rows)
+                cursor.execute(
+                    "SELECT symbol, confidence FROM announcements WHERE symbol = ANY(%s)",
+                    ([row['symbol'] for row in rows],)
+                )
+                copied = dict(cursor.fetchall())
+        finally:
+            conn.rollback()
+
+    assert copied == _row_path_confidence(announcements)
+
+
+# Rows exercising the None / missing / whitespace cases the two preparation paths must agree on
+PARITY_ANNOUNCEMENTS = [
+    {'SCRIP_CD': 500325, 'SLONGNAME': ' Reliance ', 'NEWS_DT': '2025-07-25T10:15:00.123',
+     'CATEGORYNAME': 'Result ', 'NEWSSUB': 'x' * 700, 'NEWSID': 'a', 'minio_path': 'bse/a.pdf',
+     'pdf_stored': True},
+    {'SCRIP_CD': '500400', 'SLONGNAME': None, 'NEWS_DT': '', 'DT_TM': '2025-07-25T11:15:00+05:30',
+     'CATEGORYNAME': None, 'NEWSSUB': None, 'NEWSID': 'b', 'pdf_stored': None},
+    {'SCRIP_CD': '500500', 'NEWS_DT': '2025-07-25T12:00:00Z', 'CATEGORYNAME': 'Board Meeting',
+     'NEWSID': 'c'},
+    {'SCRIP_CD': None, 'NEWS_DT': '2025-07-25T12:00:00', 'NEWSID': 'd'},
+    {'SCRIP_CD': '500600', 'NEWS_DT': None, 'NEWSID': 'e'},
+]
+
+
+def test_vectorized_batch_matches_row_path():
+    # Large enough to take the pandas path inside insert_announcements
+    announcements = [
+        {**announcement, 'NEWSID': f"{announcement['NEWSID']}{i}"}
+        for i in range(1000)
+        for announcement in PARITY_ANNOUNCEMENTS
+    ]
+    manager = BSEDatabaseManager.__new__(BSEDatabaseManager)
+    expected = [row for row in map(manager._prepare_announcement_data, announcements) if row]
+
+    assert BSEDatabaseManager._prepare_announcements_batch(announcements) == expected
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for FinancialDataProcessor: batches above and below the pandas pre-filter threshold
+must classify the same announcements identically, and records leave as plain dicts.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('minio')
+pytest.importorskip('httpx')
+
+from etl import financial_data_processor
+from etl.financial_data_processor import FinancialDataProcessor, _VECTORIZE_THRESHOLD
+
+CATEGORIES = ['Result', 'Results ', 'Board Meeting', ' Board Meeting', 'Company Update', '', None]
+SUBJECTS = [
+    'Financial Results for the quarter ended 30.06.2025',
+    'Board Meeting to approve Unaudited Standalone results for Q1 FY2026',
+    'Intimation of AGM', 'Quarterly Results', '', None
+]
+
+
+class _NoStorage:
+    """Stands in for BSEPDFStorage so the processor can be built without MinIO"""
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def processor(monkeypatch, tmp_path):
+    monkeypatch.setattr(financial_data_processor, 'BSEPDFStorage', _NoStorage)
+    return FinancialDataProcessor(cache_dir=str(tmp_path))
+
+
+def _announcements(count: int):
+    rng = random.Random(7)
+    announcements = []
+    for i in range(count):
+        announcement = {
+            'SCRIP_CD': 500000 + i, 'SLONGNAME': f'Company {i}', 'NEWS_DT': '2025-07-25T10:15:00',
+            'ATTACHMENTNAME': rng.choice(['', f'{i}.pdf']), 'NEWSID': str(i)
+        }
+        # Leave the key out now and then, so missing and explicit None are both covered
+        for key, choices in (('CATEGORYNAME', CATEGORIES), ('NEWSSUB', SUBJECTS)):
+            if rng.random() > 0.1:
+                announcement[key] = rng.choice(choices)
+        announcements.append(announcement)
+    return announcements
+
+
+def test_candidates_same_above_and_below_threshold(processor):
+    announcements = _announcements(_VECTORIZE_THRESHOLD + 500)
+    vectorized = processor._financial_candidates(announcements)
+    kept = {id(announcement) for announcement, _, _ in vectorized}
+
+    per_row = [
+        candidate
+        for start in range(0, len(announcements), 100)
+        for candidate in processor._financial_candidates(announcements[start:start + 100])
+        if id(candidate[0]) in kept
+    ]
+
+    assert vectorized == per_row
+
+
+def test_records_same_above_and_below_threshold(processor):
+    announcements = _announcements(_VECTORIZE_THRESHOLD + 500)
+    vectorized = [processor._classify(*candidate) for candidate in processor._financial_candidates(announcements)]
+
+    per_row = [
+        processor._classify(*candidate)
+        for start in range(0, len(announcements), 100)
+        for candidate in processor._financial_candidates(announcements[start:start + 100])
+    ]
+
+    # Stored category and the extraction run on the subject must not depend on the batch size
+    assert vectorized == [record for record in per_row if record is not None]
+    assert all(record.category != 'None' for record in vectorized)
+
+
+def test_records_convert_to_plain_dicts(processor):
+    record = processor._classify(
+        {'SCRIP_CD': 500325, 'SLONGNAME': 'Reliance', 'NEWS_DT': '2025-07-25T10:15:00',
+         'NEWSSUB': 'Financial Results', 'ATTACHMENTNAME': ''},
+        'Result', 'financial results'
+    )
+    data = record.to_dict()
+
+    assert type(data) is dict
+    assert list(data) == list(type(record).__slots__)
+    assert data['confidence'] == record['confidence'] == 'HIGH'
+
+
+def test_process_announcements_inside_running_loop(processor):
+    announcements = [{'SCRIP_CD': 500325, 'SLONGNAME': 'Reliance', 'NEWS_DT': '2025-07-25T10:15:00',
+                      'CATEGORYNAME': 'Result', 'NEWSSUB': 'Financial Results'}]
+
+    async def called_from_async_code():
+        return processor.process_announcements(announcements)
+
+    assert asyncio.run(called_from_async_code()) == processor.process_announcements(announcements)
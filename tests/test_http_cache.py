@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the conditional GET cache: an entry whose body cannot be read must not keep
+drawing 304s, the next request has to fetch the page unconditionally.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip('httpx')
+pytest.importorskip('requests')
+pytest.importorskip('ijson')
+pytest.importorskip('cloudscraper')
+
+from crawler.bse_ann import BSEAnnouncementsFetcher
+from crawler.http_cache import ConditionalRequestCache
+
+URL = 'https://api.bseindia.com/BseIndiaAPI/api/AnnSubCategoryGetData/w'
+PARAMS = {'pageno': 1}
+PAGE = {'Table': [{'NEWSID': '1'}]}
+
+
+def _seed_corrupt_entry(cache: ConditionalRequestCache, key: str):
+    with cache._lock:
+        cache._conn.execute(
+            "INSERT OR REPLACE INTO etags (key, etag, last_modified, body) VALUES (?, ?, ?, ?)",
+            (key, '"v1"', None, b'not gzip')
+        )
+        cache._conn.commit()
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.headers = {'ETag': '"v2"'} if status_code == 200 else {}
+        self.content = json.dumps(PAGE).encode() if status_code == 200 else b''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    """Answers 304 to any request carrying If-None-Match, and the full page otherwise."""
+
+    def __init__(self):
+        self.sent_headers = []
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        self.sent_headers.append(headers or {})
+        return _FakeResponse(304 if 'If-None-Match' in (headers or {}) else 200)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    fetcher = BSEAnnouncementsFetcher(cache_dir=str(tmp_path))
+    _seed_corrupt_entry(fetcher.etag_cache, fetcher.etag_cache.make_key(URL, PARAMS))
+    yield fetcher
+    fetcher.close()
+
+
+def test_load_drops_unreadable_entry(tmp_path):
+    cache = ConditionalRequestCache(tmp_path / 'etags.sqlite')
+    key = cache.make_key(URL, PARAMS)
+    _seed_corrupt_entry(cache, key)
+
+    assert cache.load(key) is None
+    assert cache.conditional_headers(key) == {}
+    cache.close()
+
+
+def test_corrupt_entry_refetched_unconditionally(fetcher):
+    session = _FakeSession()
+    fetcher.session = session
+
+    assert fetcher._make_request(URL, PARAMS) == PAGE
+    assert 'If-None-Match' in session.sent_headers[0]
+    assert 'If-None-Match' not in session.sent_headers[1]
+
+
+def test_corrupt_entry_refetched_unconditionally_async(fetcher):
+    sent_headers = []
+
+    def handler(request):
+        sent_headers.append(dict(request.headers))
+        if 'if-none-match' in request.headers:
+            return httpx.Response(304)
+        return httpx.Response(200, json=PAGE, headers={'ETag': '"v2"'})
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetcher._make_request_async(client, URL, PARAMS)
+
+    assert asyncio.run(fetch()) == PAGE
+    assert 'if-none-match' in sent_headers[0]
+    assert 'if-none-match' not in sent_headers[1]
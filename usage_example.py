@@ -9,7 +9,7 @@ import sys
 from datetime import datetime
 
 # Import our custom modules
-from crawler import BSEAnnouncementsFetcher
+from crawler import BSEAnnouncementsFetcher, setup_logging
 from etl import FinancialDataProcessor
 from database import BSEDatabaseManager
 
@@ -60,7 +60,7 @@ def main():
         # Financial processor only (updated example)
         if bse_data:
             financial_data = financial_processor.process_announcements(bse_data)
-            financial_processor.save_financial_data(financial_data)
+            financial_processor.save_financial_data(financial_data, timestamp=timestamp)
             print(f"Financial data extracted: {len(financial_data)}")
 
             # Show sample results
@@ -84,4 +84,5 @@ def main():
 
 
 if __name__ == "__main__":
+    setup_logging()
     main()